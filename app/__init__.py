@@ -16,17 +16,36 @@
 
 
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Depends
 from fastapi.exceptions import RequestValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.cors import CORSMiddleware
 
 from app.db import create_models
 from app.utils.validation_error import validation_error
 from app.utils.client import init
+from app.utils.http_client import http_client
 from app.utils.middleware import Middleware
 from app.routers import routers
+from app.services.action import actions_buffer
+from app.services.click import clicks_buffer
+from config import settings
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await http_client.start()
+    if settings.actions_async:
+        await actions_buffer.start()
+    if settings.clicks_buffer:
+        await clicks_buffer.start()
+    yield
+    if settings.clicks_buffer:
+        await clicks_buffer.stop()
+    if settings.actions_async:
+        await actions_buffer.stop()
+    await http_client.stop()
 
 
 app = FastAPI(
@@ -34,13 +53,11 @@ app = FastAPI(
     version='0.1',
     dependencies=[Depends(init)],
     exception_handlers={RequestValidationError: validation_error},
+    lifespan=lifespan,
 )
 
 # noinspection PyTypeChecker
-app.add_middleware(
-    middleware_class=BaseHTTPMiddleware,
-    dispatch=Middleware(),
-)
+app.add_middleware(Middleware)
 [app.include_router(router) for router in routers]
 
 
@@ -17,9 +17,11 @@
 
 from app.db.db import db
 from app.db.db_manager import db_manager_sync
+from app.db.migrations import run_migrations
 from app.db.models import models
 
 
 @db_manager_sync
 def create_models():
     db.create_tables(models=models)
+    run_migrations()
@@ -15,17 +15,64 @@
 #
 
 
+from contextvars import ContextVar
+
 from peewee import MySQLDatabase
+from playhouse.pool import PooledMySQLDatabase
 
 from config import settings
 
 
-db = MySQLDatabase(
-    host=settings.mysql_host,
-    port=settings.mysql_port,
-    user=settings.mysql_user,
-    password=settings.mysql_password,
-    database=settings.mysql_name,
-    charset='utf8mb4',
-    autoconnect=False,
-)
+# The request connection is opened lazily and no request-wide transaction is
+# started: every write is committed on its own (autocommit). Multi-step writes
+# that must be atomic wrap themselves in db.atomic() inside one executor call.
+class RequestScope:
+    def __init__(self):
+        self.connection_opened = False
+
+    def release(self):
+        if self.connection_opened:
+            self.connection_opened = False
+            if not db.is_closed() and not db.in_transaction():
+                db.close()
+
+
+request_scope: ContextVar[RequestScope | None] = ContextVar('request_scope', default=None)
+
+
+class LazyConnectionMixin:
+    def cursor(self, *args, **kwargs):
+        scope = request_scope.get()
+        if scope is not None and self.is_closed():
+            self.connect()
+            scope.connection_opened = True
+        return super().cursor(*args, **kwargs)
+
+
+class LazyPooledMySQLDatabase(LazyConnectionMixin, PooledMySQLDatabase):
+    pass
+
+
+class LazyMySQLDatabase(LazyConnectionMixin, MySQLDatabase):
+    pass
+
+
+db_params = {
+    'host': settings.mysql_host,
+    'port': settings.mysql_port,
+    'user': settings.mysql_user,
+    'password': settings.mysql_password,
+    'database': settings.mysql_name,
+    'charset': 'utf8mb4',
+    'autoconnect': False,
+}
+
+if settings.mysql_pool:
+    db = LazyPooledMySQLDatabase(
+        max_connections=settings.mysql_pool_max_connections,
+        stale_timeout=settings.mysql_pool_stale_timeout,
+        timeout=settings.mysql_pool_timeout,
+        **db_params,
+    )
+else:
+    db = LazyMySQLDatabase(**db_params)
@@ -0,0 +1,49 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+
+from app.db.db import db
+from config import settings
+
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.mysql_executor_workers,
+    thread_name_prefix='db',
+)
+
+
+def _execute(function, *args, **kwargs):
+    with db.connection_context():
+        return function(*args, **kwargs)
+
+
+async def run_in_executor(function, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(_execute, function, *args, **kwargs))
+
+
+def db_executor(function):
+    @wraps(function)
+    async def wrapper(*args, **kwargs):
+        return await run_in_executor(function, *args, **kwargs)
+
+    wrapper.sync = function
+    return wrapper
@@ -0,0 +1,148 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from functools import partial
+
+from peewee import fn
+from playhouse.migrate import SchemaMigrator, migrate
+
+from app.db.db import db
+from app.db.models import Migration, Sms, SmsStatuses, Partner, Client, Referral
+
+
+# Indexes are frozen per migration as (name, table, columns, unique), so a later
+# change to the models cannot alter what an earlier migration creates. Names are
+# the ones MySQLMigrator.add_index generates.
+indexes_0001 = (
+    ('accounts_username', 'accounts', ('username',), False),
+    ('clicks_partner_id_created_at', 'clicks', ('partner_id', 'created_at'), False),
+    ('clients_phone', 'clients', ('phone',), False),
+    ('leads_partner_id_created_at', 'leads', ('partner_id', 'created_at'), False),
+    ('leads_phone', 'leads', ('phone',), False),
+    ('partners_code_is_deleted', 'partners', ('code', 'is_deleted'), False),
+    ('partners_promotion_id_is_deleted', 'partners', ('promotion_id', 'is_deleted'), False),
+    ('permissions_id_str', 'permissions', ('id_str',), False),
+    ('referrals_partner_id_created_at', 'referrals', ('partner_id', 'created_at'), False),
+)
+indexes_0004 = (
+    ('sms_status_next_attempt_at', 'sms', ('status', 'next_attempt_at'), False),
+)
+indexes_0006 = (
+    ('partners_code', 'partners', ('code',), True),
+)
+indexes_0007 = (
+    ('stats_period_started_at', 'stats', ('period', 'started_at'), False),
+)
+indexes_0009 = (
+    ('clients_phone', 'clients', ('phone',), True),
+)
+
+
+def get_indexes_by_columns(table: str) -> dict[tuple[tuple, bool], str]:
+    return {(tuple(index.columns), index.unique): index.name for index in db.get_indexes(table)}
+
+
+def create_indexes(indexes: tuple):
+    migrator = SchemaMigrator.from_database(db)
+    for name, table, columns, unique in indexes:
+        indexes_by_columns = get_indexes_by_columns(table=table)
+        if name in indexes_by_columns.values() or (columns, unique) in indexes_by_columns:
+            continue
+        migrate(migrator.add_index(table, columns, unique=unique))
+
+
+def backfill_stats():
+    # Stats are rebuilt outside of startup with stats_rebuild.py
+    pass
+
+
+def add_sms_outbox_columns():
+    columns_names = [column.name for column in db.get_columns(Sms._meta.table_name)]
+    migrator = SchemaMigrator.from_database(db)
+    migrate(*[
+        migrator.add_column(Sms._meta.table_name, field.column_name, field)
+        for field in (Sms.phone, Sms.status, Sms.attempts, Sms.next_attempt_at, Sms.sent_at, Sms.error)
+        if field.column_name not in columns_names
+    ])
+    Sms.update(status=SmsStatuses.SENT).where(Sms.phone.is_null()).execute()
+
+
+def deduplicate_partners_codes():
+    from app.services.partner import PartnerService
+
+    duplicated_codes = [
+        code
+        for code, in Partner.select(Partner.code).group_by(Partner.code).having(fn.COUNT(Partner.id) > 1).tuples()
+    ]
+    codes = {code for code, in Partner.select(Partner.code).tuples()}
+    for code in duplicated_codes:
+        partners = list(Partner.select().where(Partner.code == code).order_by(Partner.is_deleted, Partner.id))
+        for partner in partners[1:]:
+            new_code = PartnerService.generate_referral_code()
+            while new_code in codes:
+                new_code = PartnerService.generate_referral_code()
+            codes.add(new_code)
+            Partner.update(code=new_code).where(Partner.id == partner.id).execute()
+    index_name = get_indexes_by_columns(table=Partner._meta.table_name).get((('code', 'is_deleted'), False))
+    if index_name:
+        migrate(SchemaMigrator.from_database(db).drop_index(Partner._meta.table_name, index_name))
+
+
+def deduplicate_clients_phones():
+    duplicated_phones = [
+        phone
+        for phone, in Client.select(Client.phone).group_by(Client.phone).having(fn.COUNT(Client.id) > 1).tuples()
+    ]
+    for phone in duplicated_phones:
+        clients = list(Client.select().where(Client.phone == phone).order_by(Client.id))
+        client, duplicates_ids = clients[0], [duplicate.id for duplicate in clients[1:]]
+        Partner.update(client=client.id).where(Partner.client.in_(duplicates_ids)).execute()
+        Referral.update(client=client.id).where(Referral.client.in_(duplicates_ids)).execute()
+        if any(duplicate.is_partner for duplicate in clients[1:]):
+            Client.update(is_partner=True).where(Client.id == client.id).execute()
+        Client.delete().where(Client.id.in_(duplicates_ids)).execute()
+    index_name = get_indexes_by_columns(table=Client._meta.table_name).get((('phone',), False))
+    if index_name:
+        migrate(SchemaMigrator.from_database(db).drop_index(Client._meta.table_name, index_name))
+
+
+migrations = (
+    ('0001_create_indexes', partial(create_indexes, indexes=indexes_0001)),
+    ('0002_backfill_stats', backfill_stats),
+    ('0003_add_sms_outbox_columns', add_sms_outbox_columns),
+    ('0004_create_indexes', partial(create_indexes, indexes=indexes_0004)),
+    ('0005_deduplicate_partners_codes', deduplicate_partners_codes),
+    ('0006_create_indexes', partial(create_indexes, indexes=indexes_0006)),
+    ('0007_create_indexes', partial(create_indexes, indexes=indexes_0007)),
+    ('0008_deduplicate_clients_phones', deduplicate_clients_phones),
+    ('0009_create_indexes', partial(create_indexes, indexes=indexes_0009)),
+)
+
+
+def run_migrations():
+    locked, = db.execute_sql('SELECT GET_LOCK(%s, %s)', ('migrations', 300)).fetchone()
+    if locked != 1:
+        raise Exception('Could not acquire migrations lock')
+    try:
+        migrations_names = [migration.name for migration in Migration.select()]
+        for name, function in migrations:
+            if name in migrations_names:
+                continue
+            function()
+            Migration.create(name=name)
+    finally:
+        db.execute_sql('SELECT RELEASE_LOCK(%s)', ('migrations',))
@@ -19,9 +19,11 @@ from .account import Account
 from .account_role import AccountRole
 from .action import Action
 from .action_parameter import ActionParameter
+from .cache_version import CacheVersion
 from .click import Click
 from .client import Client
 from .lead import Lead
+from .migration import Migration
 from .referral import Referral
 from .permission import Permission
 from .promotion import Promotion
@@ -29,9 +31,13 @@ from .partner import Partner
 from .role import Role
 from .role_permission import RolePermission
 from .session import Session
-from .sms import Sms
+from .sms import Sms, SmsStatuses
+from .stat import Stat, StatKinds, StatPeriods
 
 models = (
+    Migration,
+    CacheVersion,
+
     Account,
     Role,
     Permission,
@@ -50,4 +56,5 @@ models = (
     Click,
     Lead,
     Sms,
+    Stat,
 )
@@ -22,7 +22,7 @@ from .base import BaseModel
 
 class Account(BaseModel):
     id = PrimaryKeyField()
-    username = CharField(max_length=32)
+    username = CharField(max_length=32, index=True)
     password_salt = CharField(max_length=32)
     password_hash = CharField(max_length=32)
     is_active = BooleanField(default=True)
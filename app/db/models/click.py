@@ -30,3 +30,6 @@ class Click(BaseModel):
 
     class Meta:
         db_table = 'clicks'
+        indexes = (
+            (('partner', 'created_at'), False),
+        )
@@ -23,7 +23,7 @@ class Client(BaseModel):
     id = PrimaryKeyField()
     fullname = CharField(max_length=128, null=False)
     email = CharField(max_length=128, null=False)
-    phone = CharField(max_length=16, null=False)
+    phone = CharField(max_length=16, null=False, unique=True)
     is_partner = BooleanField(default=False)
     created_at = DateTimeField(default=lambda: datetime.now(tz=timezone.utc))
 
@@ -27,9 +27,12 @@ class Lead(BaseModel):
     id = PrimaryKeyField()
     partner = ForeignKeyField(model=Partner, backref='leads')
     name = CharField(max_length=256)
-    phone = CharField(max_length=16)
+    phone = CharField(max_length=16, index=True)
     is_processed = BooleanField(default=False)
     created_at = DateTimeField(default=lambda: datetime.now(tz=timezone.utc))
 
     class Meta:
         db_table = 'leads'
+        indexes = (
+            (('partner', 'created_at'), False),
+        )
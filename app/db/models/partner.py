@@ -24,10 +24,13 @@ from .promotion import Promotion
 
 class Partner(BaseModel):
     id = PrimaryKeyField()
-    code = CharField(max_length=6)
+    code = CharField(max_length=6, unique=True)
     promotion = ForeignKeyField(model=Promotion)
     client = ForeignKeyField(model=Client)
     is_deleted = BooleanField(default=False)
 
     class Meta:
         db_table = 'partners'
+        indexes = (
+            (('promotion', 'is_deleted'), False),
+        )
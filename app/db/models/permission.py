@@ -22,7 +22,7 @@ from .base import BaseModel
 
 class Permission(BaseModel):
     id = PrimaryKeyField()
-    id_str = CharField(max_length=32)
+    id_str = CharField(max_length=32, index=True)
     name = CharField(max_length=32)
     is_deleted = BooleanField(default=False)
 
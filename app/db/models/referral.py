@@ -29,3 +29,6 @@ class Referral(BaseModel):
 
     class Meta:
         db_table = 'referrals'
+        indexes = (
+            (('partner', 'created_at'), False),
+        )
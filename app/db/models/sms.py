@@ -23,12 +23,28 @@ from .base import BaseModel
 from .partner import Partner
 
 
+class SmsStatuses:
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+
 class Sms(BaseModel):
     id = PrimaryKeyField()
     model = CharField(max_length=16)
     model_id = IntegerField()
+    phone = CharField(max_length=16, null=True)
     message = CharField(max_length=1024)
+    status = CharField(max_length=16, default=SmsStatuses.PENDING)
+    attempts = IntegerField(default=0)
+    next_attempt_at = DateTimeField(null=True, default=lambda: datetime.now(tz=timezone.utc))
+    sent_at = DateTimeField(null=True)
+    error = CharField(max_length=1024, null=True)
     created_at = DateTimeField(default=lambda: datetime.now(tz=timezone.utc))
 
     class Meta:
         db_table = 'sms'
+        indexes = (
+            (('status', 'next_attempt_at'), False),
+        )
@@ -0,0 +1,48 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from peewee import PrimaryKeyField, ForeignKeyField, CharField, DateTimeField, IntegerField
+
+from .base import BaseModel
+from .partner import Partner
+
+
+class StatKinds:
+    CLICK = 'click'
+    LEAD = 'lead'
+    REFERRAL = 'referral'
+
+
+class StatPeriods:
+    HOUR = 'hour'
+    DAY = 'day'
+
+
+class Stat(BaseModel):
+    id = PrimaryKeyField()
+    partner = ForeignKeyField(model=Partner, backref='stats')
+    kind = CharField(max_length=16)
+    period = CharField(max_length=8)
+    started_at = DateTimeField()
+    count = IntegerField(default=0)
+
+    class Meta:
+        db_table = 'stats'
+        indexes = (
+            (('partner', 'kind', 'period', 'started_at'), True),
+            (('period', 'started_at'), False),
+        )
@@ -18,6 +18,7 @@
 from .account import AccountRepository
 from .account_role import AccountRoleRepository
 from .action import ActionRepository
+from .cache_version import CacheVersionRepository
 from .permission import PermissionRepository
 from .role import RoleRepository
 from .role_permission import RolePermissionRepository
@@ -30,3 +31,4 @@ from .referral import ReferralRepository
 from .client import ClientRepository
 from .lead import LeadRepository
 from .sms import SmsRepository
+from .stat import StatRepository
@@ -17,6 +17,7 @@
 
 from peewee import DoesNotExist
 
+from app.db.executor import db_executor
 from app.db.models import Account
 from app.repositories.base import BaseRepository
 from app.utils.exceptions import ModelDoesNotExist
@@ -27,7 +28,8 @@ class AccountRepository(BaseRepository):
     model = Account
 
     @staticmethod
-    async def get_by_username(username: str) -> Account:
+    @db_executor
+    def get_by_username(username: str) -> Account:
         try:
             return Account.get(Account.username == username, Account.is_deleted == False)
         except DoesNotExist:
@@ -40,7 +42,8 @@ class AccountRepository(BaseRepository):
             )
 
     @staticmethod
-    async def is_exist_by_username(username: str) -> bool:
+    @db_executor
+    def is_exist_by_username(username: str) -> bool:
         try:
             Account.get(Account.username == username, Account.is_deleted == False)
             return True
@@ -48,7 +51,8 @@ class AccountRepository(BaseRepository):
             return False
 
     @staticmethod
-    async def search(id_, username: str, page: int) -> tuple[list[Account], int]:
+    @db_executor
+    def search(id_, username: str, page: int) -> tuple[list[Account], int]:
         if not username:
             username = ''
         if not id_:
@@ -60,8 +64,8 @@ class AccountRepository(BaseRepository):
             (Account.id % f'%{id_}%')
         )
 
-        accounts = query.limit(
+        accounts = list(query.limit(
             settings.items_per_page
-        ).offset(settings.items_per_page*(page-1)).order_by(Account.id).execute()
+        ).offset(settings.items_per_page*(page-1)).order_by(Account.id))
         results = query.count()
         return accounts, results
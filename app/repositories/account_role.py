@@ -15,8 +15,8 @@
 #
 from peewee import DoesNotExist
 
-from app.db.models import AccountRole, Account, Permission
-from .role_permission import RolePermissionRepository
+from app.db.executor import db_executor
+from app.db.models import AccountRole, Account, Permission, Role, RolePermission
 from app.repositories.base import BaseRepository
 from ..utils.exceptions import ModelAlreadyExist
 
@@ -24,7 +24,8 @@ from ..utils.exceptions import ModelAlreadyExist
 class AccountRoleRepository(BaseRepository):
     model = AccountRole
 
-    async def create(self, **kwargs):
+    @db_executor
+    def create(self, **kwargs):
         try:
             account = kwargs.get('account')
             role = kwargs.get('role')
@@ -41,25 +42,31 @@ class AccountRoleRepository(BaseRepository):
                 },
             )
         except DoesNotExist:
-            return await super().create(**kwargs)
+            return self.model.create(**kwargs)
 
     @staticmethod
-    async def get_account_permissions(account: Account, only_id_str=False) -> list[str | Permission]:
-        permissions = []
-
-        for account_role in AccountRole.select().where(
-                (AccountRole.account == account) &
-                (AccountRole.is_deleted == False)
-        ):
-            permissions += await RolePermissionRepository.get_permissions_by_role(
-                role=account_role.role,
-                only_id_str=only_id_str,
-            )
-
-        return permissions
+    @db_executor
+    def get_account_permissions_id_str(account: Account) -> frozenset[str]:
+        query = Permission.select(Permission.id_str).join(
+            RolePermission, on=(RolePermission.permission == Permission.id),
+        ).join(
+            AccountRole, on=(AccountRole.role == RolePermission.role),
+        ).where(
+            (AccountRole.account == account) &
+            (AccountRole.is_deleted == False) &
+            (RolePermission.is_deleted == False)
+        ).distinct().tuples()
+        return frozenset(id_str for id_str, in query)
 
     @staticmethod
-    async def get_list_by_account(account: Account) -> list[AccountRole]:
-        return AccountRole.select().where(
+    @db_executor
+    def get_list_by_account(account: Account) -> list[AccountRole]:
+        return list(AccountRole.select(AccountRole, Role).join(Role).where(
                 (AccountRole.account == account) &
-                (AccountRole.is_deleted == False)).execute()
+                (AccountRole.is_deleted == False)))
+
+    @db_executor
+    def get_list(self) -> list[AccountRole]:
+        return list(AccountRole.select(AccountRole, Account).join(Account).where(
+            AccountRole.is_deleted == False
+        ))
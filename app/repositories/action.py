@@ -15,6 +15,8 @@
 #
 
 
+from app.db.db import db
+from app.db.executor import db_executor
 from app.db.models import Action, ActionParameter
 from app.repositories.base import BaseRepository
 
@@ -23,5 +25,34 @@ class ActionRepository(BaseRepository):
     model = Action
 
     @staticmethod
-    async def create_parameter(action: Action, key: str, value: str) -> ActionParameter:
-        return ActionParameter.create(action=action, key=key, value=value)
+    @db_executor
+    def create_parameters(action: Action, parameters: dict):
+        if parameters:
+            ActionParameter.insert_many(
+                [
+                    {'action': action, 'key': key, 'value': value}
+                    for key, value in parameters.items()
+                ]
+            ).execute()
+
+    @staticmethod
+    @db_executor
+    def create_many(actions: list[dict]):
+        with db.atomic():
+            first_id = Action.insert_many([
+                {
+                    'model': action['model'],
+                    'model_id': action['model_id'],
+                    'action': action['action'],
+                    'created_at': action['created_at'],
+                }
+                for action in actions
+            ]).execute()
+            # InnoDB gives the rows of one multi-row insert consecutive ids
+            parameters = [
+                {'action': first_id + i, 'key': key, 'value': value}
+                for i, action in enumerate(actions)
+                for key, value in action['parameters'].items()
+            ]
+            if parameters:
+                ActionParameter.insert_many(parameters).execute()
@@ -14,28 +14,37 @@
 #
 
 
-from peewee import DoesNotExist
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Awaitable, Callable
 
+from peewee import DoesNotExist, fn, Case, Expression, Field, ModelSelect
+
+from app.db.executor import db_executor
+from app.db.models import Partner, Stat, StatPeriods
 from app.db.models.base import BaseModel
 from app.utils.exceptions import ModelDoesNotExist
+from config import settings
 
 
 class BaseRepository:
     model: BaseModel
     model_name: str
+    stat_kind: str = None
 
     def __init__(self, model: BaseModel = None):
         if model:
             self.model = model
 
-    async def is_exist(self, id_: str) -> bool:
+    @db_executor
+    def is_exist(self, id_: str) -> bool:
         try:
             self.model.get((self.model.id == id_) & (self.model.is_deleted == False))
             return True
         except DoesNotExist:
             return False
 
-    async def is_exist_by_id_str(self, id_str: str) -> bool:
+    @db_executor
+    def is_exist_by_id_str(self, id_str: str) -> bool:
         try:
             if hasattr(self.model, 'is_deleted'):
                 self.model.get((self.model.id_str == id_str) & (self.model.is_deleted == False))
@@ -46,16 +55,118 @@ class BaseRepository:
         except DoesNotExist:
             return False
 
-    async def create(self, **kwargs):
+    @db_executor
+    def create(self, **kwargs):
         return self.model.create(**kwargs)
 
-    async def get_list(self) -> list[BaseModel]:
+    @db_executor
+    def get_list(self) -> list[BaseModel]:
         if hasattr(self.model, 'is_deleted'):
-            return self.model.select().where(self.model.is_deleted == False).execute()
+            return list(self.model.select().where(self.model.is_deleted == False))
         else:
-            return self.model.select().execute()
+            return list(self.model.select())
+
+    def paginate(
+            self,
+            query: ModelSelect,
+            limit: int,
+            cursor: int = None,
+            tuples: bool = False,
+    ) -> tuple[list[BaseModel | tuple], int | None]:
+        if cursor:
+            query = query.where(self.model.id > cursor)
+        query = query.order_by(self.model.id).limit(limit + 1)
+        rows = list(query.tuples() if tuples else query)
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            return rows[:limit], last[0] if tuples else last.id
+        return rows, None
+
+    @staticmethod
+    async def iterate(
+            get_page: Callable[..., Awaitable[tuple[list[BaseModel], int | None]]],
+            batch_size: int,
+            **kwargs,
+    ) -> AsyncIterator[BaseModel]:
+        cursor = None
+        while True:
+            models, cursor = await get_page(limit=batch_size, cursor=cursor, **kwargs)
+            for model in models:
+                yield model
+            if cursor is None:
+                break
+
+    @db_executor
+    def get_page(self, limit: int, cursor: int = None) -> tuple[list[BaseModel], int | None]:
+        query = self.model.select()
+        if hasattr(self.model, 'is_deleted'):
+            query = query.where(self.model.is_deleted == False)
+        return self.paginate(query=query, limit=limit, cursor=cursor)
+
+    @db_executor
+    def get_counts_by_partners(self, partners_ids: list[int]) -> dict[int, tuple[int, int, int]]:
+        if settings.stats_rollups and self.stat_kind:
+            return self.get_counts_from_stats(group_by=Stat.partner, where=Stat.partner.in_(partners_ids))
+        return self.get_counts(group_by=self.model.partner, where=self.model.partner.in_(partners_ids))
+
+    @db_executor
+    def get_counts_by_promotions(self, promotions_ids: list[int]) -> dict[int, tuple[int, int, int]]:
+        where = (Partner.promotion.in_(promotions_ids)) & (Partner.is_deleted == False)
+        if settings.stats_rollups and self.stat_kind:
+            return self.get_counts_from_stats(group_by=Partner.promotion, where=where, join=Stat.partner)
+        return self.get_counts(group_by=Partner.promotion, where=where, join=self.model.partner)
+
+    def get_counts(self, group_by: Field, where: Expression, join: Field = None) -> dict[int, tuple[int, int, int]]:
+        now = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+        week_ago, day_ago = now - timedelta(days=7), now - timedelta(days=1)
+        query = self.model.select(
+            group_by,
+            fn.COUNT(self.model.id),
+            fn.SUM(Case(None, [(self.model.created_at > week_ago, 1)], 0)),
+            fn.SUM(Case(None, [(self.model.created_at > day_ago, 1)], 0)),
+        )
+        if join is not None:
+            query = query.join(Partner, on=(join == Partner.id))
+        query = query.where(where).group_by(group_by).tuples()
+        return {
+            id_: (int(total), int(week or 0), int(day or 0))
+            for id_, total, week, day in query
+        }
+
+    def get_counts_from_stats(
+            self,
+            group_by: Field,
+            where: Expression,
+            join: Field = None,
+    ) -> dict[int, tuple[int, int, int]]:
+        now = datetime.now(tz=timezone.utc).replace(tzinfo=None, minute=0, second=0, microsecond=0)
+        week_ago, day_ago = now - timedelta(days=7), now - timedelta(days=1)
+        # The week is read from complete day buckets, and from hour buckets only for
+        # the part of the first day that falls inside it
+        week_day = week_ago if week_ago.hour == 0 else (week_ago + timedelta(days=1)).replace(hour=0)
+        is_day, is_hour = Stat.period == StatPeriods.DAY, Stat.period == StatPeriods.HOUR
+        is_week_hour = is_hour & (Stat.started_at >= week_ago) & (Stat.started_at < week_day)
+        is_day_hour = is_hour & (Stat.started_at >= day_ago)
+        query = Stat.select(
+            group_by,
+            fn.SUM(Case(None, [(is_day, Stat.count)], 0)),
+            fn.SUM(Case(None, [((is_day & (Stat.started_at >= week_day)) | is_week_hour, Stat.count)], 0)),
+            fn.SUM(Case(None, [(is_day_hour, Stat.count)], 0)),
+        )
+        if join is not None:
+            query = query.join(Partner, on=(join == Partner.id))
+        query = query.where(
+            where &
+            (Stat.kind == self.stat_kind) &
+            (is_day | is_week_hour | is_day_hour)
+        ).group_by(group_by).tuples()
+        return {
+            id_: (int(total or 0), int(week or 0), int(day or 0))
+            for id_, total, week, day in query
+        }
 
-    async def get_by_id(self, id_: int) -> BaseModel:
+    @db_executor
+    def get_by_id(self, id_: int) -> BaseModel:
         try:
             if hasattr(self.model, 'is_deleted'):
                 model = self.model.get(
@@ -76,7 +187,8 @@ class BaseRepository:
                 },
             )
 
-    async def get_by_id_str(self, id_str: str) -> BaseModel:
+    @db_executor
+    def get_by_id_str(self, id_str: str) -> BaseModel:
         try:
             if hasattr(self.model, 'is_deleted'):
                 model = self.model.get(
@@ -98,7 +210,8 @@ class BaseRepository:
             )
 
     @staticmethod
-    async def update(model, **kwargs):
+    @db_executor
+    def update(model, **kwargs):
         for key, value in kwargs.items():
             if key[-1] == '_':
                 key = key[:-1]
@@ -119,7 +232,8 @@ class BaseRepository:
         model.save()
 
     @staticmethod
-    async def delete(model: BaseModel) -> BaseModel:
+    @db_executor
+    def delete(model: BaseModel) -> BaseModel:
         if hasattr(model, 'is_deleted'):
             model.is_deleted = True
             model.save()
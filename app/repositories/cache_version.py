@@ -0,0 +1,37 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from app.db.executor import db_executor
+from app.db.models import CacheVersion
+from app.repositories.base import BaseRepository
+
+
+class CacheVersionRepository(BaseRepository):
+    model = CacheVersion
+
+    @staticmethod
+    @db_executor
+    def get_version(name: str) -> int:
+        version = CacheVersion.select(CacheVersion.version).where(CacheVersion.name == name).scalar()
+        return version or 0
+
+    @staticmethod
+    @db_executor
+    def increment(name: str):
+        CacheVersion.insert(name=name, version=1).on_conflict(
+            update={CacheVersion.version: CacheVersion.version + 1},
+        ).execute()
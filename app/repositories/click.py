@@ -13,12 +13,66 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+from datetime import datetime
+
 from peewee import DoesNotExist
 
-from app.db.models import Click, Partner
+from app.db.db import db
+from app.db.executor import db_executor
+from app.db.models import Click, Partner, StatKinds
 from app.repositories.base import BaseRepository
+from app.repositories.stat import StatRepository
 from app.utils.exceptions import ModelAlreadyExist
 
 
 class ClickRepository(BaseRepository):
     model = Click
+    stat_kind = StatKinds.CLICK
+
+    @db_executor
+    def create(self, **kwargs):
+        with db.atomic():
+            click = Click.create(**kwargs)
+            StatRepository.increment.sync(
+                kind=StatKinds.CLICK,
+                rows=[(click.partner_id, click.created_at)],
+            )
+        return click
+
+    @staticmethod
+    @db_executor
+    def create_many(rows: list[dict]) -> int:
+        with db.atomic():
+            first_id = Click.insert_many(rows).execute()
+            StatRepository.increment.sync(
+                kind=StatKinds.CLICK,
+                rows=[(row['partner'], row['created_at']) for row in rows],
+            )
+        return first_id
+
+    @db_executor
+    def get_page_by_partner(
+            self,
+            partner: Partner,
+            limit: int,
+            cursor: int = None,
+            date_from: datetime = None,
+            date_to: datetime = None,
+    ) -> tuple[list[Click], int | None]:
+        query = Click.select().where(Click.partner == partner)
+        if date_from:
+            query = query.where(Click.created_at >= date_from)
+        if date_to:
+            query = query.where(Click.created_at < date_to)
+        return self.paginate(query=query, limit=limit, cursor=cursor)
+
+    @staticmethod
+    @db_executor
+    def delete(model: Click) -> Click:
+        with db.atomic():
+            model.delete_instance()
+            StatRepository.decrement.sync(
+                kind=StatKinds.CLICK,
+                rows=[(model.partner_id, model.created_at)],
+            )
+        return model
@@ -13,9 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from peewee import DoesNotExist
+from datetime import datetime
 
-from app.db.models import Client
+from peewee import DoesNotExist, IntegrityError
+
+from app.db.db import db
+from app.db.executor import db_executor
+from app.db.models import Client, Partner
 from app.repositories.base import BaseRepository
 from app.utils.exceptions import ModelAlreadyExist
 
@@ -23,21 +27,97 @@ from app.utils.exceptions import ModelAlreadyExist
 class ClientRepository(BaseRepository):
     model = Client
 
-    async def create(self, **kwargs):
+    @db_executor
+    def create(self, **kwargs):
         phone = kwargs.get('phone')
         try:
             client = Client.get(Client.phone == phone)
-            raise ModelAlreadyExist(
-                kwargs={
-                    'model': 'Client',
-                    'id_type': 'phone',
-                    'id_value': phone,
-                    'model_id': client.id,
-                }
-            )
         except DoesNotExist:
-            return self.model.create(**kwargs)
+            try:
+                with db.atomic():
+                    return self.model.create(**kwargs)
+            except IntegrityError:
+                client = Client.get(Client.phone == phone)
+        raise ModelAlreadyExist(
+            kwargs={
+                'model': 'Client',
+                'id_type': 'phone',
+                'id_value': phone,
+                'model_id': client.id,
+            }
+        )
+
+    @staticmethod
+    @db_executor
+    def get_or_create_many(clients: list[dict]) -> tuple[dict[str, Client], set[str]]:
+        phones = list({client['phone'] for client in clients})
+        with db.atomic():
+            clients_by_phones = {client.phone: client for client in Client.select().where(Client.phone.in_(phones))}
+            new_clients = {
+                client['phone']: client
+                for client in clients
+                if client['phone'] not in clients_by_phones
+            }
+            if new_clients:
+                # A client created concurrently by another worker is kept as is
+                Client.insert_many(list(new_clients.values())).on_conflict(
+                    update={Client.phone: Client.phone},
+                ).execute()
+                clients_by_phones.update({
+                    client.phone: client
+                    for client in Client.select().where(Client.phone.in_(list(new_clients)))
+                })
+        return clients_by_phones, set(new_clients)
 
     @staticmethod
-    async def get_available_partners():
-        return Client.select().where(Client.is_partner == True).execute()
+    @db_executor
+    def get_available_partners():
+        return list(Client.select().where(Client.is_partner == True))
+
+    @db_executor
+    def get_page_by_admin(
+            self,
+            limit: int,
+            cursor: int = None,
+            fullname: str = None,
+            phone: str = None,
+            is_partner: bool = None,
+    ) -> tuple[list[Client], int | None]:
+        query = Client.select()
+        if fullname:
+            query = query.where(Client.fullname.contains(fullname))
+        if phone:
+            query = query.where(Client.phone.contains(phone))
+        if is_partner is not None:
+            query = query.where(Client.is_partner == is_partner)
+        return self.paginate(query=query, limit=limit, cursor=cursor)
+
+    @db_executor
+    def get_export_page(
+            self,
+            limit: int,
+            cursor: int = None,
+            date_from: datetime = None,
+            date_to: datetime = None,
+            promotion_id: int = None,
+    ) -> tuple[list[tuple], int | None]:
+        query = Client.select(
+            Client.id,
+            Client.fullname,
+            Client.email,
+            Client.phone,
+            Client.is_partner,
+            Client.created_at,
+        )
+        if date_from:
+            query = query.where(Client.created_at >= date_from)
+        if date_to:
+            query = query.where(Client.created_at < date_to)
+        if promotion_id:
+            query = query.where(Client.id.in_(
+                Partner.select(Partner.client).where(
+                    (Partner.promotion == promotion_id) &
+                    (Partner.is_deleted == False)
+                )
+            ))
+        return self.paginate(query=query, limit=limit, cursor=cursor, tuples=True)
@@ -15,17 +15,24 @@
 #
 
 
+from datetime import datetime
+
 from peewee import DoesNotExist
 
-from app.db.models import Lead
+from app.db.db import db
+from app.db.executor import db_executor
+from app.db.models import Lead, Partner, StatKinds
 from app.repositories.base import BaseRepository
-from app.utils.exceptions import ModelAlreadyExist
+from app.repositories.stat import StatRepository
+from app.utils.exceptions import ModelAlreadyExist, ModelDoesNotExist
 
 
 class LeadRepository(BaseRepository):
     model = Lead
+    stat_kind = StatKinds.LEAD
 
-    async def create(self, **kwargs):
+    @db_executor
+    def create(self, **kwargs):
         phone = kwargs.get('phone')
         try:
             Lead.get(Lead.phone == phone)
@@ -37,4 +44,69 @@ class LeadRepository(BaseRepository):
                 }
             )
         except DoesNotExist:
-            return self.model.create(**kwargs)
+            # Partner codes are cached per process, so a partner deleted elsewhere is
+            # only noticed here
+            partner = kwargs.get('partner')
+            if not Partner.select().where(
+                    (Partner.id == partner) &
+                    (Partner.is_deleted == False)
+            ).exists():
+                raise ModelDoesNotExist(
+                    kwargs={
+                        'model': 'Partner',
+                        'id_type': 'id',
+                        'id_value': partner,
+                    },
+                )
+            with db.atomic():
+                lead = self.model.create(**kwargs)
+                StatRepository.increment.sync(
+                    kind=StatKinds.LEAD,
+                    rows=[(lead.partner_id, lead.created_at)],
+                )
+            return lead
+
+    @staticmethod
+    @db_executor
+    def get_list_by_partners(partners_ids: list[int]):
+        return list(Lead.select().where(
+            Lead.partner.in_(partners_ids)
+        ))
+
+    @db_executor
+    def get_export_page(
+            self,
+            limit: int,
+            cursor: int = None,
+            date_from: datetime = None,
+            date_to: datetime = None,
+            promotion_id: int = None,
+    ) -> tuple[list[tuple], int | None]:
+        query = Lead.select(
+            Lead.id,
+            Lead.created_at,
+            Lead.name,
+            Lead.phone,
+            Lead.is_processed,
+            Partner.id,
+            Partner.code,
+            Partner.promotion,
+        ).join(Partner, on=(Lead.partner == Partner.id))
+        if date_from:
+            query = query.where(Lead.created_at >= date_from)
+        if date_to:
+            query = query.where(Lead.created_at < date_to)
+        if promotion_id:
+            query = query.where(Partner.promotion == promotion_id)
+        return self.paginate(query=query, limit=limit, cursor=cursor, tuples=True)
+
+    @staticmethod
+    @db_executor
+    def delete(model: Lead) -> Lead:
+        with db.atomic():
+            model.delete_instance()
+            StatRepository.decrement.sync(
+                kind=StatKinds.LEAD,
+                rows=[(model.partner_id, model.created_at)],
+            )
+        return model
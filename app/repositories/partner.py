@@ -15,15 +15,30 @@
 #
 from peewee import DoesNotExist, fn
 
+from app.db.db import db
+from app.db.executor import db_executor
 from app.db.models import Partner, Promotion, Client
 from app.repositories.base import BaseRepository
+from app.utils.cache import Cache
 from app.utils.exceptions import ModelAlreadyExist, ModelDoesNotExist
+from config import settings
+
+
+partners_codes_cache = Cache(
+    max_size=settings.partners_codes_cache_max_size,
+    ttl=settings.partners_codes_cache_ttl,
+)
+missing_partners_codes_cache = Cache(
+    max_size=settings.partners_codes_cache_max_size,
+    ttl=settings.missing_partners_codes_cache_ttl,
+)
 
 
 class PartnerRepository(BaseRepository):
     model = Partner
 
-    async def create(self, **kwargs):
+    @db_executor
+    def create(self, **kwargs):
         client = kwargs.get('client')
         promotion = kwargs.get('promotion')
         try:
@@ -36,21 +51,28 @@ class PartnerRepository(BaseRepository):
                 }
             )
         except DoesNotExist:
+            missing_partners_codes_cache.delete(kwargs.get('code'))
             return self.model.create(**kwargs)
 
     @staticmethod
-    async def get_by_code(code: str, return_none: bool = True):
-        if return_none:
-            return Partner.get_or_none(
+    @db_executor
+    def get_by_code(code: str, return_none: bool = True):
+        query = (
+            Partner
+            .select(Partner, Client, Promotion)
+            .join(Client, on=(Partner.client == Client.id))
+            .switch(Partner)
+            .join(Promotion, on=(Partner.promotion == Promotion.id))
+            .where(
                 Partner.code == code,
                 Partner.is_deleted == False,
             )
+        )
+        if return_none:
+            return query.get_or_none()
         else:
             try:
-                return Partner.get(
-                    Partner.code == code,
-                    Partner.is_deleted == False,
-                )
+                return query.get()
             except DoesNotExist:
                 raise ModelDoesNotExist(
                     kwargs={
@@ -61,11 +83,45 @@ class PartnerRepository(BaseRepository):
                 )
 
     @staticmethod
-    async def get_by_phone(phone: str, promotion_id: int):
+    @db_executor
+    def get_ids_by_code_from_db(code: str) -> tuple[int, int] | None:
+        return Partner.select(Partner.id, Partner.promotion).where(
+            (Partner.code == code) &
+            (Partner.is_deleted == False)
+        ).tuples().get_or_none()
+
+    @staticmethod
+    async def get_ids_by_code(code: str) -> tuple[int, int]:
+        ids = partners_codes_cache.get(code)
+        if ids is None and not missing_partners_codes_cache.get(code):
+            ids = await PartnerRepository.get_ids_by_code_from_db(code=code)
+            if ids:
+                partners_codes_cache.set(code, ids)
+            else:
+                missing_partners_codes_cache.set(code, True)
+        if not ids:
+            raise ModelDoesNotExist(
+                kwargs={
+                    'model': 'Partner',
+                    'id_type': 'code',
+                    'id_value': code,
+                },
+            )
+        return ids
+
+    @staticmethod
+    async def delete(model: Partner) -> Partner:
+        partners_codes_cache.delete(model.code)
+        return await BaseRepository.delete(model=model)
+
+    @staticmethod
+    @db_executor
+    def get_by_phone(phone: str, promotion_id: int):
         query = (
             Partner
-            .select()
+            .select(Partner, Client, Promotion)
             .join(Client, on=(Partner.client == Client.id))
+            .switch(Partner)
             .join(Promotion, on=(Partner.promotion == Promotion.id))
             .where(
                 Client.phone == phone,
@@ -86,10 +142,89 @@ class PartnerRepository(BaseRepository):
             )
 
     @staticmethod
-    async def get_list_by_promotion(promotion: Promotion):
-        return Partner.select().where(
+    @db_executor
+    def get_list_by_clients_and_promotions(clients_ids: list[int], promotions_ids: list[int]) -> list[Partner]:
+        return list(Partner.select().where(
+            (Partner.client.in_(clients_ids)) &
+            (Partner.promotion.in_(promotions_ids)) &
+            (Partner.is_deleted == False)
+        ))
+
+    @staticmethod
+    @db_executor
+    def get_existing_codes(codes: list[str]) -> set[str]:
+        return {code for code, in Partner.select(Partner.code).where(Partner.code.in_(codes)).tuples()}
+
+    @staticmethod
+    @db_executor
+    def create_many(rows: list[dict]) -> list[Partner]:
+        for row in rows:
+            missing_partners_codes_cache.delete(row['code'])
+        with db.atomic():
+            Partner.insert_many(rows).execute()
+            return list(Partner.select().where(Partner.code.in_([row['code'] for row in rows])))
+
+    @staticmethod
+    @db_executor
+    def get_phones_by_promotions() -> list[tuple[int, str]]:
+        return list(
+            Partner
+            .select(Partner.promotion, Client.phone)
+            .join(Client, on=(Partner.client == Client.id))
+            .where(Partner.is_deleted == False)
+            .tuples()
+        )
+
+    @staticmethod
+    @db_executor
+    def get_list_by_promotion(promotion: Promotion):
+        return list(Partner.select(Partner, Client).join(Client).where(
             Partner.promotion == promotion,
             Partner.is_deleted == False,
-        ).execute()
+        ))
+
+    @db_executor
+    def get_page_by_promotion(
+            self,
+            promotion: Promotion,
+            limit: int,
+            cursor: int = None,
+            code: str = None,
+            phone: str = None,
+    ) -> tuple[list[Partner], int | None]:
+        query = Partner.select(Partner, Client).join(Client).where(
+            Partner.promotion == promotion,
+            Partner.is_deleted == False,
+        )
+        if code:
+            query = query.where(Partner.code == code)
+        if phone:
+            query = query.where(Client.phone.contains(phone))
+        return self.paginate(query=query, limit=limit, cursor=cursor)
 
+    @db_executor
+    def get_export_page(
+            self,
+            limit: int,
+            cursor: int = None,
+            promotion_id: int = None,
+    ) -> tuple[list[tuple], int | None]:
+        query = Partner.select(
+            Partner.id,
+            Partner.code,
+            Promotion.id,
+            Promotion.name,
+            Client.id,
+            Client.fullname,
+            Client.email,
+            Client.phone,
+        ).join(Client, on=(Partner.client == Client.id)).switch(Partner).join(
+            Promotion, on=(Partner.promotion == Promotion.id),
+        ).where(Partner.is_deleted == False)
+        if promotion_id:
+            query = query.where(Partner.promotion == promotion_id)
+        return self.paginate(query=query, limit=limit, cursor=cursor, tuples=True)
 
+    @db_executor
+    def get_ids_page(self, limit: int, cursor: int = None) -> tuple[list[tuple[int]], int | None]:
+        return self.paginate(query=Partner.select(Partner.id), limit=limit, cursor=cursor, tuples=True)
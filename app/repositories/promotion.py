@@ -15,9 +15,51 @@
 #
 
 
+from app.db.executor import db_executor
 from app.db.models import Promotion
 from app.repositories.base import BaseRepository
 
 
 class PromotionRepository(BaseRepository):
     model = Promotion
+
+    @staticmethod
+    @db_executor
+    def get_list_by_ids(ids: list[int]) -> list[Promotion]:
+        return list(Promotion.select().where(
+            (Promotion.id.in_(ids)) &
+            (Promotion.is_deleted == False)
+        ))
+
+    @db_executor
+    def get_page_by_admin(
+            self,
+            limit: int,
+            cursor: int = None,
+            name: str = None,
+    ) -> tuple[list[Promotion], int | None]:
+        query = Promotion.select().where(Promotion.is_deleted == False)
+        if name:
+            query = query.where(Promotion.name.contains(name))
+        return self.paginate(query=query, limit=limit, cursor=cursor)
+
+    @db_executor
+    def get_stream_page_by_admin(
+            self,
+            limit: int,
+            cursor: int = None,
+            name: str = None,
+    ) -> tuple[list[Promotion], int | None]:
+        query = Promotion.select(
+            Promotion.id,
+            Promotion.name,
+            Promotion.referrer_bonus,
+            Promotion.referral_bonus,
+            Promotion.sms_text_partner_create,
+            Promotion.sms_text_for_referral,
+            Promotion.sms_text_referral_bonus,
+            Promotion.sms_text_referrer_bonus,
+        ).where(Promotion.is_deleted == False)
+        if name:
+            query = query.where(Promotion.name.contains(name))
+        return self.paginate(query=query, limit=limit, cursor=cursor)
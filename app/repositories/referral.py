@@ -13,17 +13,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+from datetime import datetime
+
 from peewee import DoesNotExist
 
-from app.db.models import Referral, Partner
+from app.db.db import db
+from app.db.executor import db_executor
+from app.db.models import Referral, Partner, Client, StatKinds
 from app.repositories.base import BaseRepository
+from app.repositories.stat import StatRepository
 from app.utils.exceptions import ModelAlreadyExist
 
 
 class ReferralRepository(BaseRepository):
     model = Referral
+    stat_kind = StatKinds.REFERRAL
 
-    async def create(self, **kwargs):
+    @db_executor
+    def create(self, **kwargs):
         partner = kwargs.get('partner')
         client = kwargs.get('client')
         try:
@@ -36,10 +43,76 @@ class ReferralRepository(BaseRepository):
                 }
             )
         except DoesNotExist:
-            return self.model.create(**kwargs)
+            with db.atomic():
+                referral = self.model.create(**kwargs)
+                StatRepository.increment.sync(
+                    kind=StatKinds.REFERRAL,
+                    rows=[(referral.partner_id, referral.created_at)],
+                )
+            return referral
 
     @staticmethod
-    async def get_list_by_partner(partner: Partner):
-        return Referral.select().where(
+    @db_executor
+    def get_list_by_partner(partner: Partner):
+        return list(Referral.select().where(
             Referral.partner == partner
-        ).execute()
+        ))
+
+    @db_executor
+    def get_page_by_partner(
+            self,
+            partner: Partner,
+            limit: int,
+            cursor: int = None,
+            date_from: datetime = None,
+            date_to: datetime = None,
+    ) -> tuple[list[Referral], int | None]:
+        query = Referral.select().where(Referral.partner == partner)
+        if date_from:
+            query = query.where(Referral.created_at >= date_from)
+        if date_to:
+            query = query.where(Referral.created_at < date_to)
+        return self.paginate(query=query, limit=limit, cursor=cursor)
+
+    @db_executor
+    def get_export_page(
+            self,
+            limit: int,
+            cursor: int = None,
+            date_from: datetime = None,
+            date_to: datetime = None,
+            promotion_id: int = None,
+    ) -> tuple[list[tuple], int | None]:
+        PartnerClient = Client.alias()
+        query = Referral.select(
+            Referral.id,
+            Referral.created_at,
+            Client.id,
+            Client.fullname,
+            Client.phone,
+            Partner.id,
+            Partner.code,
+            Partner.promotion,
+            PartnerClient.fullname,
+            PartnerClient.phone,
+        ).join(Client, on=(Referral.client == Client.id)).switch(Referral).join(
+            Partner, on=(Referral.partner == Partner.id),
+        ).join(PartnerClient, on=(Partner.client == PartnerClient.id))
+        if date_from:
+            query = query.where(Referral.created_at >= date_from)
+        if date_to:
+            query = query.where(Referral.created_at < date_to)
+        if promotion_id:
+            query = query.where(Partner.promotion == promotion_id)
+        return self.paginate(query=query, limit=limit, cursor=cursor, tuples=True)
+
+    @staticmethod
+    @db_executor
+    def delete(model: Referral) -> Referral:
+        with db.atomic():
+            model.delete_instance()
+            StatRepository.decrement.sync(
+                kind=StatKinds.REFERRAL,
+                rows=[(model.partner_id, model.created_at)],
+            )
+        return model
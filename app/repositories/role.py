@@ -15,6 +15,7 @@
 #
 from peewee import DoesNotExist
 
+from app.db.executor import db_executor
 from app.db.models import Role
 from app.repositories.base import BaseRepository
 from app.utils.exceptions import ModelAlreadyExist
@@ -23,7 +24,8 @@ from app.utils.exceptions import ModelAlreadyExist
 class RoleRepository(BaseRepository):
     model = Role
 
-    async def create(self, **kwargs):
+    @db_executor
+    def create(self, **kwargs):
         try:
             name = kwargs.get('name')
             Role.get(Role.name == name)
@@ -17,15 +17,17 @@
 
 from peewee import DoesNotExist
 
-from app.db.models import Role, RolePermission
+from app.db.executor import db_executor
+from app.db.models import Permission, Role, RolePermission
 from app.repositories.base import BaseRepository
-from app.utils.exceptions import ModelAlreadyExist
+from app.utils.exceptions import ModelAlreadyExist, ModelDoesNotExist
 
 
 class RolePermissionRepository(BaseRepository):
     model = RolePermission
 
-    async def create(self, **kwargs):
+    @db_executor
+    def create(self, **kwargs):
         try:
             permission = kwargs.get('permission')
             role = kwargs.get('role')
@@ -42,22 +44,40 @@ class RolePermissionRepository(BaseRepository):
                 },
             )
         except DoesNotExist:
-            return await super().create(**kwargs)
+            return self.model.create(**kwargs)
 
 
     @staticmethod
-    async def get_permissions_by_role(role: Role, only_id_str=False) -> list[str or RolePermission]:
+    @db_executor
+    def get_permissions_by_role(role: Role, only_id_str=False) -> list[str or RolePermission]:
         return [
             role_permission.permission.id_str if only_id_str else role_permission.permission
-            for role_permission in RolePermission.select().where(
+            for role_permission in RolePermission.select(RolePermission, Permission).join(Permission).where(
                 (RolePermission.role == role) &
                 (RolePermission.is_deleted == False)
             )
         ]
 
+    @db_executor
+    def get_by_id(self, id_: int) -> RolePermission:
+        try:
+            return RolePermission.select(RolePermission, Permission).join(Permission).where(
+                (RolePermission.id == id_) &
+                (RolePermission.is_deleted == False)
+            ).get()
+        except DoesNotExist:
+            raise ModelDoesNotExist(
+                kwargs={
+                    'model': 'RolePermission',
+                    'id_type': 'id',
+                    'id_value': id_,
+                },
+            )
+
     @staticmethod
-    async def get_list_by_role(role: Role) -> list[RolePermission]:
-        return RolePermission.select().where(
+    @db_executor
+    def get_list_by_role(role: Role) -> list[RolePermission]:
+        return list(RolePermission.select(RolePermission, Permission).join(Permission).where(
                 (RolePermission.role == role) &
                 (RolePermission.is_deleted == False)
-            )
+            ))
@@ -15,9 +15,60 @@
 #
 
 
-from app.db.models import Session
+from peewee import DoesNotExist
+
+from app.db.executor import db_executor
+from app.db.models import Session, Account
 from app.repositories.base import BaseRepository
+from app.utils.cache import Cache
+from app.utils.exceptions import ModelDoesNotExist
+from config import settings
+
+
+sessions_cache = Cache(
+    max_size=settings.sessions_cache_max_size,
+    ttl=settings.sessions_cache_ttl,
+)
 
 
 class SessionRepository(BaseRepository):
     model = Session
+
+    @staticmethod
+    @db_executor
+    def get_by_id_with_account(id_: int) -> Session:
+        try:
+            return Session.select(Session, Account).join(Account).where(
+                (Session.id == id_) &
+                (Session.is_deleted == False)
+            ).get()
+        except DoesNotExist:
+            raise ModelDoesNotExist(
+                kwargs={
+                    'model': 'Session',
+                    'id_type': 'id',
+                    'id_value': id_,
+                },
+            )
+
+    @staticmethod
+    async def delete(model: Session) -> Session:
+        sessions_cache.delete(model.id)
+        return await BaseRepository.delete(model=model)
+
+    @staticmethod
+    async def invalidate_cache_by_account(account: Account):
+        sessions_cache.delete_by(lambda _, data: dict(data[0])['account'] == account.id)
+
+    # The cache holds immutable row snapshots; every request gets its own instances
+    @staticmethod
+    def to_cache(session: Session) -> tuple[tuple, tuple]:
+        return tuple(session.__data__.items()), tuple(session.account.__data__.items())
+
+    @staticmethod
+    def from_cache(data: tuple[tuple, tuple]) -> Session:
+        session_data, account_data = data
+        session = Session(**dict(session_data))
+        session.account = Account(**dict(account_data))
+        session._dirty.clear()
+        return session
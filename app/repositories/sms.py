@@ -14,9 +14,69 @@
 # limitations under the License.
 #
 
-from app.db.models import Sms
+
+from datetime import datetime, timezone, timedelta
+
+from app.db.executor import db_executor
+from app.db.models import Sms, SmsStatuses
 from app.repositories.base import BaseRepository
 
 
 class SmsRepository(BaseRepository):
     model = Sms
+
+    @staticmethod
+    @db_executor
+    def create_many(rows: list[dict]):
+        if rows:
+            Sms.insert_many(rows).execute()
+
+    @staticmethod
+    @db_executor
+    def get_list_to_send(limit: int) -> list[Sms]:
+        return list(Sms.select().where(
+            (Sms.status.in_([SmsStatuses.PENDING, SmsStatuses.SENDING])) &
+            (Sms.next_attempt_at <= datetime.now(tz=timezone.utc))
+        ).order_by(Sms.next_attempt_at).limit(limit))
+
+    @staticmethod
+    @db_executor
+    def claim(sms: Sms, lease: int) -> bool:
+        return Sms.update(
+            status=SmsStatuses.SENDING,
+            attempts=Sms.attempts + 1,
+            next_attempt_at=datetime.now(tz=timezone.utc) + timedelta(seconds=lease),
+        ).where(
+            (Sms.id == sms.id) &
+            (Sms.attempts == sms.attempts)
+        ).execute() == 1
+
+    @staticmethod
+    @db_executor
+    def release(sms: Sms, next_attempt_at: datetime):
+        Sms.update(
+            status=SmsStatuses.PENDING,
+            attempts=Sms.attempts - 1,
+            next_attempt_at=next_attempt_at,
+        ).where(
+            (Sms.id == sms.id) &
+            (Sms.attempts == sms.attempts + 1)
+        ).execute()
+
+    @staticmethod
+    @db_executor
+    def set_sent(sms: Sms):
+        Sms.update(
+            status=SmsStatuses.SENT,
+            sent_at=datetime.now(tz=timezone.utc),
+            error=None,
+        ).where(Sms.id == sms.id).execute()
+
+    @staticmethod
+    @db_executor
+    def set_failed(sms: Sms, error: str, next_attempt_at: datetime = None):
+        Sms.update(
+            status=SmsStatuses.PENDING if next_attempt_at else SmsStatuses.FAILED,
+            next_attempt_at=next_attempt_at,
+            error=error[:1024],
+        ).where(Sms.id == sms.id).execute()
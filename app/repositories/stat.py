@@ -0,0 +1,122 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Iterable
+
+from peewee import chunked
+
+from app.db.db import db
+from app.db.executor import db_executor
+from app.db.models import Stat, StatPeriods
+from app.db.models.base import BaseModel
+from app.repositories.base import BaseRepository
+
+
+class StatRepository(BaseRepository):
+    model = Stat
+
+    @staticmethod
+    def get_started_at(created_at: datetime, period: str) -> datetime:
+        if created_at.tzinfo:
+            created_at = created_at.astimezone(tz=timezone.utc).replace(tzinfo=None)
+        started_at = created_at.replace(minute=0, second=0, microsecond=0)
+        if period == StatPeriods.DAY:
+            started_at = started_at.replace(hour=0)
+        return started_at
+
+    @staticmethod
+    def get_counts(rows: Iterable[tuple[int, datetime]]) -> Counter:
+        counts = Counter()
+        for partner_id, created_at in rows:
+            for period in (StatPeriods.HOUR, StatPeriods.DAY):
+                counts[(partner_id, period, StatRepository.get_started_at(created_at=created_at, period=period))] += 1
+        return counts
+
+    @staticmethod
+    @db_executor
+    def increment(kind: str, rows: list[tuple[int, datetime]]):
+        counts = StatRepository.get_counts(rows=rows)
+        for (partner_id, period, started_at), count in sorted(counts.items()):
+            Stat.insert(
+                partner=partner_id,
+                kind=kind,
+                period=period,
+                started_at=started_at,
+                count=count,
+            ).on_conflict(
+                update={Stat.count: Stat.count + count},
+            ).execute()
+
+    @staticmethod
+    @db_executor
+    def decrement(kind: str, rows: list[tuple[int, datetime]]):
+        counts = StatRepository.get_counts(rows=rows)
+        for (partner_id, period, started_at), count in sorted(counts.items()):
+            Stat.update(
+                count=Stat.count - count,
+            ).where(
+                (Stat.partner == partner_id) &
+                (Stat.kind == kind) &
+                (Stat.period == period) &
+                (Stat.started_at == started_at)
+            ).execute()
+
+    @staticmethod
+    @db_executor
+    def rebuild(kind: str, model: BaseModel, partners_ids: list[int]):
+        # Stats of the partners are deleted before their rows are read, in one
+        # transaction. Concurrent increments for these partners block on the deleted
+        # range until commit, so a row is counted either by this snapshot or by its
+        # own increment, never both. Other partners are not locked.
+        with db.atomic():
+            Stat.delete().where(
+                (Stat.kind == kind) &
+                (Stat.partner.in_(partners_ids))
+            ).execute()
+            counts = StatRepository.get_counts(
+                rows=model.select(model.partner, model.created_at).where(
+                    model.partner.in_(partners_ids)
+                ).tuples().iterator(),
+            )
+            stats = [
+                {
+                    'partner': partner_id,
+                    'kind': kind,
+                    'period': period,
+                    'started_at': started_at,
+                    'count': count,
+                }
+                for (partner_id, period, started_at), count in counts.items()
+            ]
+            for batch in chunked(stats, 1000):
+                Stat.insert_many(batch).execute()
+
+    @staticmethod
+    @db_executor
+    def delete_hours_before(started_at: datetime, limit: int) -> int:
+        ids = [
+            id_
+            for id_, in Stat.select(Stat.id).where(
+                (Stat.period == StatPeriods.HOUR) &
+                (Stat.started_at < started_at)
+            ).limit(limit).tuples()
+        ]
+        if ids:
+            Stat.delete().where(Stat.id.in_(ids)).execute()
+        return len(ids)
@@ -15,11 +15,15 @@
 #
 
 
+from datetime import datetime
+from typing import Optional
+
 from fastapi import Depends
 from pydantic import BaseModel, Field
 
 from app.services import ClickService
 from app.utils import Router, Response
+from config import settings
 
 
 router = Router(
@@ -30,9 +34,20 @@ router = Router(
 class ClickGetListByAdminSchema(BaseModel):
     token: str = Field(min_length=32, max_length=64)
     partner_id: int = Field()
+    limit: int = Field(default=settings.pagination_limit, ge=1, le=settings.pagination_limit_max)
+    cursor: Optional[int] = Field(default=None)
+    date_from: Optional[datetime] = Field(default=None)
+    date_to: Optional[datetime] = Field(default=None)
 
 
 @router.get()
 async def route(schema: ClickGetListByAdminSchema = Depends()):
-    result = await ClickService().get_list_by_admin(token=schema.token, partner_id=schema.partner_id)
+    result = await ClickService().get_list_by_admin(
+        token=schema.token,
+        partner_id=schema.partner_id,
+        limit=schema.limit,
+        cursor=schema.cursor,
+        date_from=schema.date_from,
+        date_to=schema.date_to,
+    )
     return Response(**result)
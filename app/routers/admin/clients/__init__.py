@@ -17,6 +17,8 @@
 
 from app.utils import Router
 from .get_list import router as router_get_list
+from .export import router as router_export
+from .get_stream import router as router_get_stream
 from .get import router as router_get
 from .create import router as router_create
 from .delete import router as router_delete
@@ -30,6 +32,8 @@ router = Router(
         router_delete,
         router_get,
         router_get_list,
+        router_export,
+        router_get_stream,
         router_partners_get_list,
     ],
     tags=['Clients'],
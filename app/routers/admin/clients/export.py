@@ -0,0 +1,48 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Depends
+from pydantic import BaseModel, Field, PositiveInt
+
+from app.services import ClientService
+from app.utils import Router, CsvResponse
+
+
+router = Router(
+    prefix='/export',
+)
+
+
+class ClientExportByAdminSchema(BaseModel):
+    token: str = Field(min_length=32, max_length=64)
+    date_from: Optional[datetime] = Field(default=None)
+    date_to: Optional[datetime] = Field(default=None)
+    promotion_id: Optional[PositiveInt] = Field(default=None)
+
+
+@router.get()
+async def route(schema: ClientExportByAdminSchema = Depends()):
+    result = await ClientService().export_by_admin(
+        token=schema.token,
+        date_from=schema.date_from,
+        date_to=schema.date_to,
+        promotion_id=schema.promotion_id,
+    )
+    return CsvResponse(**result)
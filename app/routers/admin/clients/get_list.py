@@ -15,11 +15,14 @@
 #
 
 
+from typing import Optional
+
 from fastapi import Depends
 from pydantic import BaseModel, Field
 
 from app.services import ClientService
 from app.utils import Router, Response
+from config import settings
 
 
 router = Router(
@@ -29,11 +32,21 @@ router = Router(
 
 class ClientGetListByAdminSchema(BaseModel):
     token: str = Field(min_length=32, max_length=64)
+    limit: int = Field(default=settings.pagination_limit, ge=1, le=settings.pagination_limit_max)
+    cursor: Optional[int] = Field(default=None)
+    fullname: Optional[str] = Field(default=None, max_length=128)
+    phone: Optional[str] = Field(default=None, max_length=16)
+    is_partner: Optional[bool] = Field(default=None)
 
 
 @router.get()
 async def route(schema: ClientGetListByAdminSchema = Depends()):
     result = await ClientService().get_list_by_admin(
         token=schema.token,
+        limit=schema.limit,
+        cursor=schema.cursor,
+        fullname=schema.fullname,
+        phone=schema.phone,
+        is_partner=schema.is_partner,
     )
     return Response(**result)
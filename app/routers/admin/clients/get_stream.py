@@ -0,0 +1,48 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from typing import Optional
+
+from fastapi import Depends
+from pydantic import BaseModel, Field
+
+from app.services import ClientService
+from app.utils import Router, StreamResponse, StreamFormats
+
+
+router = Router(
+    prefix='/list/stream',
+)
+
+
+class ClientGetStreamByAdminSchema(BaseModel):
+    token: str = Field(min_length=32, max_length=64)
+    format: str = Field(default=StreamFormats.json, pattern=f'^({StreamFormats.json}|{StreamFormats.ndjson})$')
+    fullname: Optional[str] = Field(default=None, max_length=128)
+    phone: Optional[str] = Field(default=None, max_length=16)
+    is_partner: Optional[bool] = Field(default=None)
+
+
+@router.get()
+async def route(schema: ClientGetStreamByAdminSchema = Depends()):
+    items = await ClientService().get_stream_by_admin(
+        token=schema.token,
+        fullname=schema.fullname,
+        phone=schema.phone,
+        is_partner=schema.is_partner,
+    )
+    return StreamResponse(key='clients', items=items, format_=schema.format)
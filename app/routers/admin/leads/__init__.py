@@ -17,12 +17,14 @@
 
 from app.utils import Router
 from .update import router as router_update
+from .export import router as router_export
 
 
 router = Router(
     prefix='/leads',
     routes_included=[
-        router_update
+        router_update,
+        router_export,
     ],
     tags=['Leads'],
 )
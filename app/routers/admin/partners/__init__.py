@@ -17,9 +17,11 @@
 
 from app.utils import Router
 from .get_list import router as router_get_list
+from .export import router as router_export
 from .get import router as router_get
 from .get_by_phone import router as router_get_by_phone
 from .create import router as router_create
+from .bulk_upsert import router as router_bulk_upsert
 from .delete import router as router_delete
 from .delete_by_phone import router as router_delete_by_phone
 
@@ -28,8 +30,10 @@ router = Router(
     prefix='/partners',
     routes_included=[
         router_create,
+        router_bulk_upsert,
         router_delete,
         router_get_list,
+        router_export,
         router_get,
         router_get_by_phone,
         router_delete_by_phone,
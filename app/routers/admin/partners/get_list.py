@@ -15,11 +15,14 @@
 #
 
 
+from typing import Optional
+
 from fastapi import Depends
 from pydantic import BaseModel, Field, PositiveInt
 
 from app.services import PartnerService
 from app.utils import Router, Response
+from config import settings
 
 
 router = Router(
@@ -30,6 +33,10 @@ router = Router(
 class PartnerGetListByAdminSchema(BaseModel):
     token: str = Field(min_length=32, max_length=64)
     promotion_id: PositiveInt = Field()
+    limit: int = Field(default=settings.pagination_limit, ge=1, le=settings.pagination_limit_max)
+    cursor: Optional[int] = Field(default=None)
+    code: Optional[str] = Field(default=None, max_length=6)
+    phone: Optional[str] = Field(default=None, max_length=16)
 
 
 @router.get()
@@ -37,5 +44,9 @@ async def route(schema: PartnerGetListByAdminSchema = Depends()):
     result = await PartnerService().get_list_by_admin(
         token=schema.token,
         promotion_id=schema.promotion_id,
+        limit=schema.limit,
+        cursor=schema.cursor,
+        code=schema.code,
+        phone=schema.phone,
     )
     return Response(**result)
@@ -18,6 +18,7 @@
 from app.utils import Router
 from .get import router as router_get
 from .get_list import router as router_get_list
+from .get_stream import router as router_get_stream
 from .update import router as router_update
 from .create import router as router_create
 from .delete import router as router_delete
@@ -31,6 +32,7 @@ router = Router(
         router_update,
         router_get,
         router_get_list,
+        router_get_stream,
     ],
     tags=['Promotions'],
 )
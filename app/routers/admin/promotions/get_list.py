@@ -15,11 +15,14 @@
 #
 
 
+from typing import Optional
+
 from fastapi import Depends
 from pydantic import BaseModel, Field
 
 from app.services import PromotionService
 from app.utils import Router, Response
+from config import settings
 
 
 router = Router(
@@ -29,11 +32,17 @@ router = Router(
 
 class PromotionGetListByAdminSchema(BaseModel):
     token: str = Field(min_length=32, max_length=64)
+    limit: int = Field(default=settings.pagination_limit, ge=1, le=settings.pagination_limit_max)
+    cursor: Optional[int] = Field(default=None)
+    name: Optional[str] = Field(default=None, max_length=128)
 
 
 @router.get()
 async def route(schema: PromotionGetListByAdminSchema = Depends()):
     result = await PromotionService().get_list_by_admin(
         token=schema.token,
+        limit=schema.limit,
+        cursor=schema.cursor,
+        name=schema.name,
     )
     return Response(**result)
@@ -17,6 +17,7 @@
 from app.utils import Router
 from .get import router as router_get
 from .get_list import router as router_get_list
+from .export import router as router_export
 from .add import router as router_add
 
 
@@ -25,6 +26,7 @@ router = Router(
     routes_included=[
         router_get,
         router_get_list,
+        router_export,
         router_add,
     ],
     tags=['Referrals'],
@@ -15,11 +15,15 @@
 #
 
 
+from datetime import datetime
+from typing import Optional
+
 from fastapi import Depends
 from pydantic import BaseModel, Field, PositiveInt
 
 from app.services import ReferralService
 from app.utils import Router, Response
+from config import settings
 
 
 router = Router(
@@ -30,6 +34,10 @@ router = Router(
 class ReferralGetListByAdminSchema(BaseModel):
     token: str = Field(min_length=32, max_length=64)
     partner_id: PositiveInt = Field()
+    limit: int = Field(default=settings.pagination_limit, ge=1, le=settings.pagination_limit_max)
+    cursor: Optional[int] = Field(default=None)
+    date_from: Optional[datetime] = Field(default=None)
+    date_to: Optional[datetime] = Field(default=None)
 
 
 @router.get()
@@ -37,5 +45,9 @@ async def route(schema: ReferralGetListByAdminSchema = Depends()):
     result = await ReferralService().get_list_by_admin(
         token=schema.token,
         partner_id=schema.partner_id,
+        limit=schema.limit,
+        cursor=schema.cursor,
+        date_from=schema.date_from,
+        date_to=schema.date_to,
     )
     return Response(**result)
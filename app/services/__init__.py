@@ -32,3 +32,4 @@ from .referral import ReferralService
 from .client import ClientService
 from .lead import LeadService
 from .sms import SmsService
+from .stat import StatService
@@ -15,8 +15,9 @@
 #
 
 from app.db.models import Account, Session
-from app.repositories import AccountRepository, AccountRoleRepository
+from app.repositories import AccountRepository, AccountRoleRepository, SessionRepository
 from app.services.account_role import AccountRoleService
+from app.services.account_role_check_premission import AccountRoleCheckPermissionService
 from app.services.base import BaseService
 from app.utils.crypto import create_salt, create_hash_by_string_and_salt
 from app.utils.decorators import session_required
@@ -107,6 +108,7 @@ class AccountService(BaseService):
             password_hash=password_hash,
             is_active=is_active,
         )
+        await SessionRepository.invalidate_cache_by_account(account=account)
 
         await self.create_action(
             model=account,
@@ -125,6 +127,7 @@ class AccountService(BaseService):
         account = await AccountRepository().get_by_id(id_=id_)
 
         await AccountRepository().delete(model=account)
+        await SessionRepository.invalidate_cache_by_account(account=account)
 
         await self.create_action(
             model=account,
@@ -200,7 +203,7 @@ class AccountService(BaseService):
                 {
                     'id': role.id,
                     'name': role.role.name,
-                    'role_id': role.role.id,
+                    'role_id': role.role_id,
                 }
                 for role in roles
             ],
@@ -208,7 +211,6 @@ class AccountService(BaseService):
         }
 
         if with_permissions:
-            permissions = await AccountRoleRepository().get_account_permissions(account=account, only_id_str=True)
-            permissions = list(set(permissions))
-            account_dict['permissions'] = permissions
+            permissions = await AccountRoleCheckPermissionService.get_permissions(account=account)
+            account_dict['permissions'] = list(permissions)
         return account_dict
@@ -17,6 +17,7 @@
 
 from app.db.models import AccountRole, Session
 from app.repositories import AccountRepository, AccountRoleRepository, RoleRepository
+from app.services.account_role_check_premission import AccountRoleCheckPermissionService
 from app.services.base import BaseService
 from app.utils.decorators import session_required
 
@@ -36,6 +37,7 @@ class AccountRoleService(BaseService):
             account=account,
             role=role,
         )
+        await AccountRoleCheckPermissionService.invalidate()
 
         await self.create_action(
             model=account_role,
@@ -58,6 +60,7 @@ class AccountRoleService(BaseService):
     ):
         account_role = await AccountRoleRepository().get_by_id(id_=id_)
         await AccountRoleRepository().delete(model=account_role)
+        await AccountRoleCheckPermissionService.invalidate()
 
         await self.create_action(
             model=account_role,
@@ -77,9 +80,9 @@ class AccountRoleService(BaseService):
             'accounts_roles': [
                 {
                     'id': account_role.id,
-                    'account_id': account_role.account.id,
+                    'account_id': account_role.account_id,
                     'username': account_role.account.username,
-                    'role': account_role.role.id,
+                    'role': account_role.role_id,
                 } for account_role in accounts_roles
             ]
         }
@@ -92,7 +95,7 @@ class AccountRoleService(BaseService):
             'account_roles': [
                 {
                     'id': account_role.id,
-                    'role_id': account_role.role.id,
+                    'role_id': account_role.role_id,
                 } for account_role in accounts_roles
             ]
         }
@@ -16,20 +16,38 @@
 
 
 from app.db.models import Account
-from app.repositories import AccountRoleRepository
+from app.repositories import AccountRoleRepository, CacheVersionRepository
 from app.services.base import BaseService
+from app.utils.cache import Cache
 from app.utils.exceptions import AccountMissingPermission
+from config import settings
+
+
+permissions_cache = Cache(
+    max_size=settings.permissions_cache_max_size,
+    ttl=settings.permissions_cache_ttl,
+)
 
 
 class AccountRoleCheckPermissionService(BaseService):
-    @staticmethod
-    async def get_permissions(account: Account):
-        permissions = await AccountRoleRepository.get_account_permissions(
-            account=account,
-            only_id_str=True,
-        )
+    # The version lives in the database, so a change on one worker invalidates
+    # the permissions cached by every other worker
+    cache_version_name = 'permissions'
+
+    @classmethod
+    async def get_permissions(cls, account: Account) -> frozenset[str]:
+        version = await CacheVersionRepository.get_version(name=cls.cache_version_name)
+        cached = permissions_cache.get(account.id)
+        if cached and cached[0] == version:
+            return cached[1]
+        permissions = await AccountRoleRepository.get_account_permissions_id_str(account=account)
+        permissions_cache.set(account.id, (version, permissions))
         return permissions
 
+    @classmethod
+    async def invalidate(cls):
+        await CacheVersionRepository.increment(name=cls.cache_version_name)
+
     async def check_permission(self, account: Account, id_str: str):
         if account.id == 0:
             return
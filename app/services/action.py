@@ -15,9 +15,12 @@
 #
 
 
+from datetime import datetime, timezone
 from logging import debug
 
 from app.repositories import ActionRepository
+from app.utils.buffer import Buffer
+from config import settings
 
 
 class ActionService:
@@ -31,16 +34,49 @@ class ActionService:
         if not parameters:
             parameters = {}
 
-        action = await ActionRepository().create(model=model, model_id=model_id, action=action)
-
-        params_str = ''
-        for key, value in parameters.items():
-            await ActionRepository().create_parameter(action=action, key=key, value=value)
-            if not value:
-                value = 'none'
-            params_str += f'{key.upper()} = {str(value).upper()}\n'
+        if settings.actions_async:
+            await actions_buffer.put({
+                'model': model,
+                'model_id': model_id,
+                'action': action,
+                'parameters': parameters,
+                'created_at': datetime.now(tz=timezone.utc),
+            })
+        else:
+            action_model = await ActionRepository().create(model=model, model_id=model_id, action=action)
+            await ActionRepository().create_parameters(action=action_model, parameters=parameters)
 
+        params_str = ''.join(
+            f'{key.upper()} = {str(value).upper() if value else "NONE"}\n'
+            for key, value in parameters.items()
+        )
         debug(
-            msg=f'ACTION: {action.model.upper()}.{action.model_id}.{action.action.upper()}. '
+            msg=f'ACTION: {model.upper()}.{model_id}.{action.upper()}. '
                 f'PARAMS: \n{params_str}',
         )
+
+    @staticmethod
+    async def create_many(actions: list[dict]):
+        actions = [
+            {
+                'model': action['model'],
+                'model_id': action['model_id'],
+                'action': action['action'],
+                'parameters': action.get('parameters') or {},
+                'created_at': datetime.now(tz=timezone.utc),
+            }
+            for action in actions
+        ]
+        if settings.actions_async:
+            for action in actions:
+                await actions_buffer.put(action)
+        elif actions:
+            await ActionRepository.create_many(actions)
+
+
+actions_buffer = Buffer(
+    name='actions',
+    function=ActionRepository().create_many,
+    max_size=settings.actions_buffer_max_size,
+    flush_interval=settings.actions_buffer_flush_interval,
+)
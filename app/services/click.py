@@ -15,10 +15,15 @@
 #
 
 
+from datetime import datetime, timezone
+
+from app.services.action import ActionService
 from app.services.base import BaseService
 from app.repositories import ClickRepository, PartnerRepository
 from app.db.models import Session
+from app.utils.buffer import Buffer
 from app.utils.decorators import session_required
+from config import settings
 
 
 class ClickService(BaseService):
@@ -26,22 +31,50 @@ class ClickService(BaseService):
             self,
             code: str,
     ):
-        partner = await PartnerRepository().get_by_code(code=code)
+        partner_id, _ = await PartnerRepository.get_ids_by_code(code=code)
+
+        if settings.clicks_buffer:
+            await clicks_buffer.put({
+                'partner': partner_id,
+                'created_at': datetime.now(tz=timezone.utc).isoformat(),
+            })
+            return {}
 
         click = await ClickRepository().create(
-            partner=partner,
+            partner=partner_id,
         )
 
         await self.create_action(
             model=click,
             action='create',
             parameters={
-                'partner': partner.id,
+                'partner': partner_id,
             }
         )
 
         return {}
 
+    @staticmethod
+    async def create_many(items: list[dict]):
+        first_id = await ClickRepository().create_many(
+            rows=[
+                {
+                    'partner': item['partner'],
+                    'created_at': datetime.fromisoformat(item['created_at']),
+                }
+                for item in items
+            ],
+        )
+
+        await ActionService.create(
+            model='click',
+            model_id=first_id,
+            action='create_many',
+            parameters={
+                'count': len(items),
+            },
+        )
+
     @session_required(permissions=['promotions'])
     async def delete_by_admin(
             self,
@@ -64,13 +97,38 @@ class ClickService(BaseService):
         return {}
 
     @session_required(permissions=['promotions'], return_model=False, can_root=True)
-    async def get_list_by_admin(self, partner_id: int):
+    async def get_list_by_admin(
+            self,
+            partner_id: int,
+            limit: int = settings.pagination_limit,
+            cursor: int = None,
+            date_from: datetime = None,
+            date_to: datetime = None,
+    ):
         partner = await PartnerRepository().get_by_id(partner_id)
+        clicks, next_cursor = await ClickRepository().get_page_by_partner(
+            partner=partner,
+            limit=limit,
+            cursor=cursor,
+            date_from=date_from,
+            date_to=date_to,
+        )
         return {
             'clicks': [
                 {
                     'id': click.id,
-                    'partner': click.partner.id,
-                } for click in await partner.clicks
-            ]
+                    'partner': click.partner_id,
+                    'created_at': click.created_at,
+                } for click in clicks
+            ],
+            'cursor': next_cursor,
         }
+
+
+clicks_buffer = Buffer(
+    name='clicks',
+    function=ClickService.create_many,
+    max_size=settings.clicks_buffer_max_size,
+    flush_interval=settings.clicks_buffer_flush_interval,
+    spill_dir=settings.clicks_buffer_spill_dir,
+)
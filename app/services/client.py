@@ -14,8 +14,10 @@
 # limitations under the License.
 #
 
+from datetime import datetime
 from json import loads
 from types import SimpleNamespace
+from typing import AsyncIterator
 
 from pydantic import Json
 
@@ -26,6 +28,7 @@ from app.utils.decorators import session_required, tasks_token_required
 from app.utils.exceptions import ModelAlreadyExist
 from app.utils.normalize_phone import normalize_phone_number
 from app.utils.sms_request import sms_request
+from config import settings
 
 
 class ClientService(BaseService):
@@ -66,6 +69,39 @@ class ClientService(BaseService):
 
         return {'id': client.id}
 
+    async def get_or_create_by_task(
+            self,
+            fullname: str,
+            phone: str,
+            email: str = None,
+            is_partner: bool = False,
+    ) -> Client:
+        phone = normalize_phone_number(phone)
+
+        try:
+            client = await ClientRepository().create(
+                fullname=fullname,
+                email=email,
+                is_partner=is_partner,
+                phone=phone,
+            )
+        except ModelAlreadyExist as e:
+            return await ClientRepository().get_by_id(id_=e.kwargs['model_id'])
+
+        await self.create_action(
+            model=client,
+            action='create',
+            parameters={
+                'creator': 'sync_task',
+                'fullname': fullname,
+                'email': email,
+                'phone': phone,
+                'is_partner': is_partner,
+            }
+        )
+
+        return client
+
     @session_required(permissions=['clients'], can_root=True)
     async def delete_by_admin(
             self,
@@ -98,12 +134,64 @@ class ClientService(BaseService):
         }
 
     @session_required(permissions=['clients'], return_model=False, can_root=True)
-    async def get_list_by_admin(self):
+    async def get_list_by_admin(
+            self,
+            limit: int = settings.pagination_limit,
+            cursor: int = None,
+            fullname: str = None,
+            phone: str = None,
+            is_partner: bool = None,
+    ):
+        clients, next_cursor = await ClientRepository().get_page_by_admin(
+            limit=limit,
+            cursor=cursor,
+            fullname=fullname,
+            phone=phone,
+            is_partner=is_partner,
+        )
         return {
             'clients': [
                 await self.generate_client_dict(client=client)
-                for client in await ClientRepository().get_list()
-            ]
+                for client in clients
+            ],
+            'cursor': next_cursor,
+        }
+
+    @session_required(permissions=['clients'], return_model=False, can_root=True)
+    async def get_stream_by_admin(
+            self,
+            fullname: str = None,
+            phone: str = None,
+            is_partner: bool = None,
+    ) -> AsyncIterator[dict]:
+        async def generate():
+            async for client in ClientRepository.iterate(
+                    get_page=ClientRepository().get_page_by_admin,
+                    batch_size=settings.stream_batch_size,
+                    fullname=fullname,
+                    phone=phone,
+                    is_partner=is_partner,
+            ):
+                yield await self.generate_client_dict(client=client)
+        return generate()
+
+    @session_required(permissions=['clients'], return_model=False, can_root=True)
+    async def export_by_admin(
+            self,
+            date_from: datetime = None,
+            date_to: datetime = None,
+            promotion_id: int = None,
+    ):
+        return {
+            'filename': 'clients.csv',
+            'columns': ['id', 'fullname', 'email', 'phone', 'is_partner', 'created_at'],
+            'rows': ClientRepository.iterate(
+                get_page=ClientRepository().get_export_page,
+                batch_size=settings.stream_batch_size,
+                date_from=date_from,
+                date_to=date_to,
+                promotion_id=promotion_id,
+            ),
         }
 
     @session_required(permissions=['partners'], return_model=False, can_root=True)
@@ -15,11 +15,14 @@
 #
 
 
+from datetime import datetime
+
 from app.services.base import BaseService
 from app.repositories import ClickRepository, PartnerRepository, LeadRepository
 from app.db.models import Session, Lead
 from app.utils.decorators import session_required
 from app.utils.normalize_phone import normalize_phone_number
+from config import settings
 
 
 class LeadService(BaseService):
@@ -29,12 +32,12 @@ class LeadService(BaseService):
             name: str,
             phone: str,
     ):
-        partner = await PartnerRepository().get_by_code(code=code, return_none=False)
+        partner_id, _ = await PartnerRepository.get_ids_by_code(code=code)
 
         phone = normalize_phone_number(phone)
 
         lead = await LeadRepository().create(
-            partner=partner,
+            partner=partner_id,
             name=name,
             phone=phone,
         )
@@ -43,7 +46,7 @@ class LeadService(BaseService):
             model=lead,
             action='create',
             parameters={
-                'partner': partner.id,
+                'partner': partner_id,
                 'name': name,
                 'phone': phone,
             }
@@ -76,13 +79,32 @@ class LeadService(BaseService):
 
         return {}
 
+    @session_required(permissions=['partners'], return_model=False, can_root=True)
+    async def export_by_admin(
+            self,
+            date_from: datetime = None,
+            date_to: datetime = None,
+            promotion_id: int = None,
+    ):
+        return {
+            'filename': 'leads.csv',
+            'columns': ['id', 'created_at', 'name', 'phone', 'is_processed', 'partner_id', 'partner_code', 'promotion_id'],
+            'rows': LeadRepository.iterate(
+                get_page=LeadRepository().get_export_page,
+                batch_size=settings.stream_batch_size,
+                date_from=date_from,
+                date_to=date_to,
+                promotion_id=promotion_id,
+            ),
+        }
+
     @staticmethod
     async def generate_lead_dict(lead: Lead):
         return {
             'id': lead.id,
-            'partner_id': lead.partner.id,
+            'partner_id': lead.partner_id,
             'name': lead.name,
             'phone': lead.phone,
             'is_processed': lead.is_processed,
-            'created_at': str(lead.created_at),
+            'created_at': lead.created_at,
         }
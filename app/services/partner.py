@@ -13,19 +13,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-import base64
 import binascii
 from base64 import b64decode
 from random import choice
 
+from peewee import IntegrityError
+
+from app.services.action import ActionService
 from app.services.sms import SmsService
 from app.services.base import BaseService
-from app.repositories import PartnerRepository, PromotionRepository, ClientRepository
+from app.repositories import PartnerRepository, PromotionRepository, ClientRepository, ReferralRepository, \
+    ClickRepository, LeadRepository
 from app.db.models import Partner, Session, Client, Promotion
+from app.utils.codes_pool import CodesPool
 from app.utils.crypto import generate_base64_string
 from app.utils.decorators import session_required
-from app.utils.exceptions.main import VariableDoesNotMatchFormat, ModelDoesNotExist
-from app.utils.sms_request import sms_request
+from app.utils.exceptions.main import VariableDoesNotMatchFormat
+from app.utils.normalize_phone import normalize_phone_number
 from config import settings
 
 
@@ -40,48 +44,25 @@ class PartnerService(BaseService):
         promotion: Promotion = await PromotionRepository().get_by_id(id_=promotion_id)
         client: Client = await ClientRepository().get_by_id(id_=client_id)
 
-        while True:
-            code = self.generate_referral_code()
+        for attempt in range(settings.partner_code_attempts):
+            code = await partner_codes_pool.get()
             try:
-                await PartnerRepository().get_by_code(code, return_none=False)
-            except ModelDoesNotExist:
+                partner = await PartnerRepository().create(
+                    code=code,
+                    promotion=promotion,
+                    client=client,
+                )
                 break
+            except IntegrityError:
+                if attempt == settings.partner_code_attempts - 1:
+                    raise
 
-        partner = await PartnerRepository().create(
-            code=code,
-            promotion=promotion,
-            client=client,
-        )
-
-        if promotion.sms_text_partner_create:
-            message_partner_create = promotion.sms_text_partner_create.format(
-                fullname=client.fullname,
-                link=f'{settings.referral_site_url}/{await generate_base64_string(code)}',
-                referrer_bonus=int(promotion.referrer_bonus),
-                referral_bonus=int(promotion.referral_bonus),
-            )
-            await sms_request(
-                phone_number=client.phone,
-                message=message_partner_create,
-            )
-            await SmsService().create(
-                model='partner',
-                model_id=partner.id,
-                message=message_partner_create,
-            )
-        if promotion.sms_text_for_referral:
-            message_partner_promo = promotion.sms_text_for_referral.format(
-                link=f'{settings.referral_site_url}/{await generate_base64_string(code)}',
-                referral_bonus=int(promotion.referral_bonus),
-            )
-            await sms_request(
-                phone_number=client.phone,
-                message=message_partner_promo
-            )
+        for message in await self.generate_sms_messages(promotion=promotion, client=client, code=code):
             await SmsService().create(
                 model='partner',
                 model_id=partner.id,
-                message=message_partner_promo,
+                phone=client.phone,
+                message=message,
             )
 
         await self.create_action(
@@ -100,6 +81,122 @@ class PartnerService(BaseService):
 
         return {'id': partner.id}
 
+    async def bulk_upsert(
+            self,
+            creator: str,
+            items: list[dict],
+    ) -> list[dict]:
+        results = [{'promotion_id': item['promotion_id'], 'phone': item['phone']} for item in items]
+        for result in results:
+            try:
+                result['phone'] = normalize_phone_number(result['phone'])
+            except ValueError:
+                result.update(state='error', error='phone')
+
+        promotions = {
+            promotion.id: promotion
+            for promotion in await PromotionRepository.get_list_by_ids(
+                ids=list({result['promotion_id'] for result in results}),
+            )
+        }
+        for result in results:
+            if 'state' not in result and result['promotion_id'] not in promotions:
+                result.update(state='error', error='promotion_id')
+        valid_results = [(item, result) for item, result in zip(items, results) if 'state' not in result]
+        if not valid_results:
+            return results
+
+        clients, new_clients_phones = await ClientRepository.get_or_create_many(
+            clients=[
+                {'fullname': item['fullname'], 'phone': result['phone'], 'email': None, 'is_partner': True}
+                for item, result in valid_results
+            ],
+        )
+        partners = {
+            (partner.client_id, partner.promotion_id): partner
+            for partner in await PartnerRepository.get_list_by_clients_and_promotions(
+                clients_ids=[client.id for client in clients.values()],
+                promotions_ids=list(promotions),
+            )
+        }
+
+        new_partners = {}
+        for _, result in valid_results:
+            client = clients[result['phone']]
+            key = (client.id, result['promotion_id'])
+            result['client_id'] = client.id
+            if key in partners:
+                result.update(state='exists', id=partners[key].id)
+            elif key not in new_partners:
+                new_partners[key] = result
+        created_partners = {}
+        for attempt in range(settings.partner_code_attempts):
+            if not new_partners:
+                break
+            codes = await partner_codes_pool.get_many(count=len(new_partners))
+            for result, code in zip(new_partners.values(), codes):
+                result['code'] = code
+            try:
+                created_partners = {
+                    (partner.client_id, partner.promotion_id): partner
+                    for partner in await PartnerRepository.create_many(
+                        rows=[
+                            {'code': result['code'], 'promotion': promotion_id, 'client': client_id}
+                            for (client_id, promotion_id), result in new_partners.items()
+                        ],
+                    )
+                }
+                break
+            except IntegrityError:
+                if attempt == settings.partner_code_attempts - 1:
+                    raise
+
+        smses, actions = [], [
+            {
+                'model': 'client',
+                'model_id': clients[phone].id,
+                'action': 'create',
+                'parameters': {'creator': creator, 'phone': phone, 'is_partner': True},
+            }
+            for phone in new_clients_phones
+        ]
+        for key, partner in created_partners.items():
+            client, promotion = clients[new_partners[key]['phone']], promotions[partner.promotion_id]
+            for message in await self.generate_sms_messages(promotion=promotion, client=client, code=partner.code):
+                smses.append({'model': 'partner', 'model_id': partner.id, 'phone': client.phone, 'message': message})
+            actions.append({
+                'model': 'partner',
+                'model_id': partner.id,
+                'action': 'create',
+                'parameters': {'creator': creator, 'client': client.id, 'promotion': promotion.id},
+            })
+        await SmsService.create_many(smses=smses)
+        await ActionService.create_many(actions=actions)
+
+        for _, result in valid_results:
+            result.pop('code', None)
+            if 'state' in result:
+                continue
+            key = (result['client_id'], result['promotion_id'])
+            result.update(
+                state='created' if new_partners[key] is result else 'exists',
+                id=created_partners[key].id,
+            )
+        return results
+
+    @session_required(permissions=['partners', 'clients'], can_root=True)
+    async def bulk_upsert_by_admin(
+            self,
+            session: Session,
+            items: list[dict],
+    ):
+        return {
+            'results': await self.bulk_upsert(
+                creator=f'session_{session.id}',
+                items=items,
+            ),
+        }
+
     @session_required(permissions=['partners'], can_root=True)
     async def create_by_admin(
             self,
@@ -169,14 +266,23 @@ class PartnerService(BaseService):
             session=session,
         )
 
+    async def delete_by_phone_by_task(
+            self,
+            phone: str,
+            promotion_id: int,
+    ):
+        partner = await PartnerRepository().get_by_phone(phone=phone, promotion_id=promotion_id)
+        return await self._delete(id_=partner.id)
+
     @session_required(permissions=['partners'], return_model=False)
     async def get_by_admin(
             self,
             code: str,
     ):
         partner: Partner = await PartnerRepository().get_by_code(code)
+        partners_dicts = await self.generate_partners_dicts(partners=[partner])
         return {
-            'partner': await self.generate_partner_dict(partner)
+            'partner': partners_dicts[0]
         }
 
     @session_required(permissions=['partners'], return_model=False, can_root=True)
@@ -186,59 +292,134 @@ class PartnerService(BaseService):
             promotion_id: int,
     ):
         partner: Partner = await PartnerRepository().get_by_phone(phone, promotion_id)
+        partners_dicts = await self.generate_partners_dicts(partners=[partner])
         return {
-            'partner': await self.generate_partner_dict(partner)
+            'partner': partners_dicts[0]
         }
 
     @session_required(permissions=['partners'], return_model=False, can_root=True)
-    async def get_list_by_admin(self, promotion_id: int):
+    async def get_list_by_admin(
+            self,
+            promotion_id: int,
+            limit: int = settings.pagination_limit,
+            cursor: int = None,
+            code: str = None,
+            phone: str = None,
+    ):
         promotion = await PromotionRepository().get_by_id(id_=promotion_id)
+        partners, next_cursor = await PartnerRepository().get_page_by_promotion(
+            promotion=promotion,
+            limit=limit,
+            cursor=cursor,
+            code=code,
+            phone=phone,
+        )
         return {
-            'partners': [
-                await self.generate_partner_dict(partner)
-                for partner in await PartnerRepository().get_list_by_promotion(promotion)
-            ]
+            'partners': await self.generate_partners_dicts(partners=partners),
+            'cursor': next_cursor,
+        }
+
+    @session_required(permissions=['partners'], return_model=False, can_root=True)
+    async def export_by_admin(
+            self,
+            promotion_id: int = None,
+    ):
+        return {
+            'filename': 'partners.csv',
+            'columns': [
+                'id', 'code', 'promotion_id', 'promotion_name', 'client_id', 'fullname', 'email', 'phone',
+            ],
+            'rows': PartnerRepository.iterate(
+                get_page=PartnerRepository().get_export_page,
+                batch_size=settings.stream_batch_size,
+                promotion_id=promotion_id,
+            ),
         }
 
     @session_required(permissions=['partners'], return_model=False, can_root=True)
     async def get_list_available_by_admin(self, promotion_id: int):
         promotion = await PromotionRepository().get_by_id(id_=promotion_id)
+        partners = await PartnerRepository().get_list_by_promotion(promotion)
         return {
-            'partners': [
-                await self.generate_partner_dict(partner)
-                for partner in await PartnerRepository().get_list_by_promotion(promotion)
-            ]
+            'partners': await self.generate_partners_dicts(partners=partners)
         }
 
     @staticmethod
-    async def generate_partner_dict(partner: Partner):
+    async def generate_partner_dict(
+            partner: Partner,
+            referrals: int,
+            clicks: int,
+            leads: int,
+    ):
         return {
             'id': partner.id,
             'code': partner.code,
             'fullname': partner.client.fullname,
             'email': partner.client.email,
             'phone': partner.client.phone,
-            'referrals': len(partner.referrals),
-            'clicks': len(partner.clicks),
-            'leads': len(partner.leads),
-            'client': partner.client.id,
+            'referrals': referrals,
+            'clicks': clicks,
+            'leads': leads,
+            'client': partner.client_id,
         }
 
+    async def generate_partners_dicts(
+            self,
+            partners: list[Partner],
+            referrals_counts: dict = None,
+            clicks_counts: dict = None,
+            leads_counts: dict = None,
+    ):
+        partners_ids = [partner.id for partner in partners]
+        if referrals_counts is None:
+            referrals_counts = await ReferralRepository().get_counts_by_partners(partners_ids=partners_ids)
+        if clicks_counts is None:
+            clicks_counts = await ClickRepository().get_counts_by_partners(partners_ids=partners_ids)
+        if leads_counts is None:
+            leads_counts = await LeadRepository().get_counts_by_partners(partners_ids=partners_ids)
+        return [
+            await self.generate_partner_dict(
+                partner,
+                referrals=referrals_counts.get(partner.id, (0,))[0],
+                clicks=clicks_counts.get(partner.id, (0,))[0],
+                leads=leads_counts.get(partner.id, (0,))[0],
+            )
+            for partner in partners
+        ]
+
     @staticmethod
     async def check_code(base64code: str):
         try:
-            code = base64.b64decode(base64code).decode()
+            code = b64decode(base64code).decode()
         except Exception as e:
             raise VariableDoesNotMatchFormat(
                 kwargs={
                     'variable': 'code'
                 }
             )
-        await PartnerRepository().get_by_code(code, return_none=False)
+        await PartnerRepository.get_ids_by_code(code=code)
         return {
             'code': code
         }
 
+    @staticmethod
+    async def generate_sms_messages(promotion: Promotion, client: Client, code: str) -> list[str]:
+        messages = []
+        link = f'{settings.referral_site_url}/{await generate_base64_string(code)}'
+        if promotion.sms_text_partner_create:
+            messages.append(promotion.sms_text_partner_create.format(
+                fullname=client.fullname,
+                link=link,
+                referrer_bonus=int(promotion.referrer_bonus),
+                referral_bonus=int(promotion.referral_bonus),
+            ))
+        if promotion.sms_text_for_referral:
+            messages.append(promotion.sms_text_for_referral.format(
+                link=link,
+                referral_bonus=int(promotion.referral_bonus),
+            ))
+        return messages
+
     @staticmethod
     def generate_referral_code():
         russian_letters = 'АБВГДЕЖЗИКЛМНОПРСТУФХЦЧШЩЭЮЯ'
@@ -246,3 +427,11 @@ class PartnerService(BaseService):
         digits = ''.join(choice('0123456789') for _ in range(4))
         referral_code = letters + digits
         return referral_code
+
+
+partner_codes_pool = CodesPool(
+    name='partner_codes',
+    generate=PartnerService.generate_referral_code,
+    get_existing=PartnerRepository.get_existing_codes,
+    size=settings.partner_codes_pool_size,
+)
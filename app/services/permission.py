@@ -15,6 +15,7 @@
 #
 
 
+from app.services.account_role_check_premission import AccountRoleCheckPermissionService
 from app.services.base import BaseService
 from app.repositories import PermissionRepository
 from app.db.models import Permission, Session
@@ -66,6 +67,7 @@ class PermissionService(BaseService):
         permission = await PermissionRepository().get_by_id_str(id_str=id_str)
 
         await PermissionRepository().delete(model=permission)
+        await AccountRoleCheckPermissionService.invalidate()
 
         await self.create_action(
             model=permission,
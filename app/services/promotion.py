@@ -13,16 +13,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, AsyncIterator
 
 from app.services.lead import LeadService
 from app.services.partner import PartnerService
 from app.services.base import BaseService
-from app.repositories import PromotionRepository, ReferralRepository, PartnerRepository
-from app.db.models import Promotion, Session, Partner
+from app.repositories import PromotionRepository, ReferralRepository, PartnerRepository, ClickRepository, \
+    LeadRepository
+from app.db.models import Promotion, Session
 from app.utils.decorators import session_required
 from app.utils.exceptions import NoRequiredParameters
+from config import settings
 
 
 class PromotionService(BaseService):
@@ -172,23 +173,83 @@ class PromotionService(BaseService):
         }
 
     @session_required(permissions=['promotions'], return_model=False, can_root=True)
-    async def get_list_by_admin(self):
+    async def get_list_by_admin(
+            self,
+            limit: int = settings.pagination_limit,
+            cursor: int = None,
+            name: str = None,
+    ):
+        promotions, next_cursor = await PromotionRepository().get_page_by_admin(
+            limit=limit,
+            cursor=cursor,
+            name=name,
+        )
         return {
             'promotions': [
                 await self.generate_promotion_dict(promotion)
-                for promotion in await PromotionRepository().get_list()
-            ]
+                for promotion in promotions
+            ],
+            'cursor': next_cursor,
         }
 
+    @session_required(permissions=['promotions'], return_model=False, can_root=True)
+    async def get_stream_by_admin(
+            self,
+            name: str = None,
+    ) -> AsyncIterator[dict]:
+        return PromotionRepository.iterate(
+            get_page=self.get_stream_page,
+            batch_size=settings.stream_batch_size,
+            name=name,
+        )
+
+    @staticmethod
+    async def get_stream_page(limit: int, cursor: int = None, name: str = None) -> tuple[list[dict], int | None]:
+        promotions, next_cursor = await PromotionRepository().get_stream_page_by_admin(
+            limit=limit,
+            cursor=cursor,
+            name=name,
+        )
+        promotions_ids = [promotion.id for promotion in promotions]
+        referrals_counts = await ReferralRepository().get_counts_by_promotions(promotions_ids=promotions_ids)
+        clicks_counts = await ClickRepository().get_counts_by_promotions(promotions_ids=promotions_ids)
+        leads_counts = await LeadRepository().get_counts_by_promotions(promotions_ids=promotions_ids)
+        promotions_dicts = []
+        for promotion in promotions:
+            total_referrals, week_referrals, day_referrals = referrals_counts.get(promotion.id, (0, 0, 0))
+            total_clicks, week_clicks, day_clicks = clicks_counts.get(promotion.id, (0, 0, 0))
+            total_leads, week_leads, day_leads = leads_counts.get(promotion.id, (0, 0, 0))
+            promotions_dicts.append({
+                'id': promotion.id,
+                'name': promotion.name,
+                'referrer_bonus': promotion.referrer_bonus,
+                'referral_bonus': promotion.referral_bonus,
+                'total_referrals': total_referrals,
+                'week_referrals': week_referrals,
+                'day_referrals': day_referrals,
+                'total_clicks': total_clicks,
+                'week_clicks': week_clicks,
+                'day_clicks': day_clicks,
+                'total_leads': total_leads,
+                'week_leads': week_leads,
+                'day_leads': day_leads,
+                'sms_text_partner_create': promotion.sms_text_partner_create,
+                'sms_text_for_referral': promotion.sms_text_for_referral,
+                'sms_text_referral_bonus': promotion.sms_text_referral_bonus,
+                'sms_text_referrer_bonus': promotion.sms_text_referrer_bonus,
+            })
+        return promotions_dicts, next_cursor
+
     async def generate_promotion_dict(self, promotion: Promotion):
         partners = await PartnerRepository().get_list_by_promotion(promotion=promotion)
-        leads = []
-        for partner in partners:
-            for lead in partner.leads:
-                leads.append(lead)
-        total_referrals, week_referrals, day_referrals = await self.get_referrals_count(partners=partners)
-        total_clicks, week_clicks, day_clicks = await self.get_clicks_count(partners=partners)
-        total_leads, week_leads, day_leads = await self.get_leads_count(partners=partners)
+        partners_ids = [partner.id for partner in partners]
+        referrals_counts = await ReferralRepository().get_counts_by_partners(partners_ids=partners_ids)
+        clicks_counts = await ClickRepository().get_counts_by_partners(partners_ids=partners_ids)
+        leads_counts = await LeadRepository().get_counts_by_partners(partners_ids=partners_ids)
+        leads = await LeadRepository().get_list_by_partners(partners_ids=partners_ids)
+        total_referrals, week_referrals, day_referrals = await self.get_counts_sum(counts=referrals_counts)
+        total_clicks, week_clicks, day_clicks = await self.get_counts_sum(counts=clicks_counts)
+        total_leads, week_leads, day_leads = await self.get_counts_sum(counts=leads_counts)
         return {
             'id': promotion.id,
             'name': promotion.name,
@@ -207,10 +268,12 @@ class PromotionService(BaseService):
             'sms_text_for_referral': promotion.sms_text_for_referral,
             'sms_text_referral_bonus': promotion.sms_text_referral_bonus,
             'sms_text_referrer_bonus': promotion.sms_text_referrer_bonus,
-            'partners': [
-                await PartnerService().generate_partner_dict(partner)
-                for partner in partners
-            ],
+            'partners': await PartnerService().generate_partners_dicts(
+                partners=partners,
+                referrals_counts=referrals_counts,
+                clicks_counts=clicks_counts,
+                leads_counts=leads_counts,
+            ),
             'leads': [
                 await LeadService().generate_lead_dict(lead)
                 for lead in leads
@@ -218,40 +281,10 @@ class PromotionService(BaseService):
         }
 
     @staticmethod
-    async def get_referrals_count(partners: list[Partner]):
-        total_referrals, week_referrals, day_referrals = 0, 0, 0
-        for partner in partners:
-            referrals = await ReferralRepository().get_list_by_partner(partner=partner)
-            for referral in referrals:
-                total_referrals += 1
-                if referral.created_at > datetime.now() - timedelta(days=7):
-                    week_referrals += 1
-                    if referral.created_at > datetime.now() - timedelta(days=1):
-                        day_referrals += 1
-        return total_referrals, week_referrals, day_referrals
-
-    @staticmethod
-    async def get_clicks_count(partners: list[Partner]):
-        total_clicks, week_clicks, day_clicks = 0, 0, 0
-        for partner in partners:
-            clicks = partner.clicks
-            for click in clicks:
-                total_clicks += 1
-                if click.created_at > datetime.now() - timedelta(days=7):
-                    week_clicks += 1
-                    if click.created_at > datetime.now() - timedelta(days=1):
-                        day_clicks += 1
-        return total_clicks, week_clicks, day_clicks
-
-    @staticmethod
-    async def get_leads_count(partners: list[Partner]):
-        total_leads, week_leads, day_leads = 0, 0, 0
-        for partner in partners:
-            leads = partner.leads
-            for lead in leads:
-                total_leads += 1
-                if lead.created_at > datetime.now() - timedelta(days=7):
-                    week_leads += 1
-                    if lead.created_at > datetime.now() - timedelta(days=1):
-                        day_leads += 1
-        return total_leads, week_leads, day_leads
+    async def get_counts_sum(counts: dict[int, tuple[int, int, int]]):
+        total, week, day = 0, 0, 0
+        for partner_total, partner_week, partner_day in counts.values():
+            total += partner_total
+            week += partner_week
+            day += partner_day
+        return total, week, day
@@ -14,13 +14,15 @@
 # limitations under the License.
 #
 
+from datetime import datetime
+
 from app.db.models import Referral, Session, Promotion, Partner, Client
 from app.repositories import ReferralRepository, PartnerRepository, ClientRepository
 from app.services.sms import SmsService
 from app.services.base import BaseService
 from app.services.client import ClientService
 from app.utils.decorators import session_required
-from app.utils.sms_request import sms_request
+from config import settings
 
 
 class ReferralService(BaseService):
@@ -110,14 +112,10 @@ class ReferralService(BaseService):
                 referral_bonus=int(promotion.referrer_bonus),
             )
 
-            await sms_request(
-                phone_number=client.phone,
-                message=message_referral_bonus,
-            )
-
             await SmsService().create(
                 model='referral',
                 model_id=referral.id,
+                phone=client.phone,
                 message=message_referral_bonus,
             )
 
@@ -127,14 +125,10 @@ class ReferralService(BaseService):
                 referrer_bonus=int(promotion.referrer_bonus),
             )
 
-            await sms_request(
-                phone_number=partner.client.phone,
-                message=message_referrer_bonus,
-            )
-
             await SmsService().create(
                 model='partner',
                 model_id=partner.id,
+                phone=partner.client.phone,
                 message=message_referrer_bonus,
             )
 
@@ -181,20 +175,57 @@ class ReferralService(BaseService):
         }
 
     @session_required(permissions=['referrals'], return_model=False, can_root=True)
-    async def get_list_by_admin(self, partner_id: int):
+    async def get_list_by_admin(
+            self,
+            partner_id: int,
+            limit: int = settings.pagination_limit,
+            cursor: int = None,
+            date_from: datetime = None,
+            date_to: datetime = None,
+    ):
         partner = await PartnerRepository().get_by_id(partner_id)
+        referrals, next_cursor = await ReferralRepository().get_page_by_partner(
+            partner=partner,
+            limit=limit,
+            cursor=cursor,
+            date_from=date_from,
+            date_to=date_to,
+        )
         return {
             'referrals': [
                 await self.generate_referral_dict(referral=referral)
-                for referral in await ReferralRepository().get_list_by_partner(partner=partner)
-            ]
+                for referral in referrals
+            ],
+            'cursor': next_cursor,
+        }
+
+    @session_required(permissions=['referrals'], return_model=False, can_root=True)
+    async def export_by_admin(
+            self,
+            date_from: datetime = None,
+            date_to: datetime = None,
+            promotion_id: int = None,
+    ):
+        return {
+            'filename': 'referrals.csv',
+            'columns': [
+                'id', 'created_at', 'client_id', 'fullname', 'phone', 'partner_id', 'partner_code', 'promotion_id',
+                'partner_fullname', 'partner_phone',
+            ],
+            'rows': ReferralRepository.iterate(
+                get_page=ReferralRepository().get_export_page,
+                batch_size=settings.stream_batch_size,
+                date_from=date_from,
+                date_to=date_to,
+                promotion_id=promotion_id,
+            ),
         }
 
     @staticmethod
     async def generate_referral_dict(referral: Referral):
         return {
             'id': referral.id,
-            'partner': referral.partner.id,
-            'client': referral.client.id,
+            'partner': referral.partner_id,
+            'client': referral.client_id,
             'created_at': referral.created_at,
         }
@@ -17,6 +17,7 @@
 
 from app.db.models import Role, Session
 from app.repositories import RolePermissionRepository, RoleRepository
+from app.services.account_role_check_premission import AccountRoleCheckPermissionService
 from app.services.base import BaseService
 from app.utils.decorators import session_required
 
@@ -53,6 +54,7 @@ class RoleService(BaseService):
         role = await RoleRepository().get_by_id(id_=id_)
 
         await RoleRepository().delete(model=role)
+        await AccountRoleCheckPermissionService.invalidate()
 
         await self.create_action(
             model=role,
@@ -18,6 +18,7 @@
 from addict import Dict
 
 from app.repositories import SessionRepository
+from app.repositories.session import sessions_cache
 from app.db.models import Session
 from app.services.base import BaseService
 from app.utils.crypto import create_hash_by_string_and_salt
@@ -51,11 +52,18 @@ class SessionGetByTokenService(BaseService):
             else:
                 raise WrongRootToken()
 
-        session: Session = await SessionRepository().get_by_id(id_=session_id)
+        data = sessions_cache.get(session_id)
+        is_cached = data is not None
+        if is_cached:
+            session = SessionRepository.from_cache(data=data)
+        else:
+            session = await SessionRepository().get_by_id_with_account(id_=session_id)
         if session.token_hash == await create_hash_by_string_and_salt(
             string=token,
             salt=session.token_salt,
         ):
+            if not is_cached:
+                sessions_cache.set(session_id, SessionRepository.to_cache(session=session))
             return session
         else:
             raise WrongToken()
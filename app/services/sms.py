@@ -15,17 +15,74 @@
 #
 
 
-from logging import debug
+import asyncio
+from datetime import datetime, timezone, timedelta
+from logging import info, warning
 
-from app.repositories import ActionRepository
+from furl import furl
+
+from app.db.models import Sms
 from app.repositories.sms import SmsRepository
+from app.utils.circuit_breaker import get_circuit_breaker
+from app.utils.exceptions import ExternalServiceUnavailable
+from app.utils.sms_request import sms_request
+from config import settings
 
 
 class SmsService:
+    semaphore = asyncio.Semaphore(settings.sms_outbox_concurrency)
+
     @staticmethod
     async def create(
             model: str,
             model_id: int,
+            phone: str,
             message: str,
     ):
-        await SmsRepository().create(model=model, model_id=model_id, message=message)
+        await SmsRepository().create(model=model, model_id=model_id, phone=phone, message=message)
+
+    @staticmethod
+    async def create_many(smses: list[dict]):
+        await SmsRepository.create_many(rows=smses)
+
+    @staticmethod
+    async def send(sms: Sms):
+        async with SmsService.semaphore:
+            if not await SmsRepository.claim(sms=sms, lease=settings.sms_outbox_lease):
+                return
+            attempts = sms.attempts + 1
+            try:
+                response = await sms_request(phone_number=sms.phone, message=sms.message)
+                if response.status >= 400:
+                    raise Exception(f'SMS provider responded with status {response.status}')
+            except ExternalServiceUnavailable:
+                await SmsRepository.release(
+                    sms=sms,
+                    next_attempt_at=datetime.now(tz=timezone.utc) + timedelta(
+                        seconds=settings.circuit_breaker_recovery_timeout,
+                    ),
+                )
+                return
+            except Exception as e:
+                next_attempt_at = None
+                if attempts < settings.sms_outbox_max_attempts:
+                    next_attempt_at = datetime.now(tz=timezone.utc) + timedelta(
+                        seconds=settings.sms_outbox_backoff * 2 ** (attempts - 1),
+                    )
+                warning(f'Sms {sms.id} attempt {attempts} failed: {e!r}')
+                await SmsRepository.set_failed(sms=sms, error=repr(e), next_attempt_at=next_attempt_at)
+                return
+            await SmsRepository.set_sent(sms=sms)
+            info(f'Sms {sms.id} sent')
+
+    @staticmethod
+    async def dispatch() -> int:
+        available_calls = get_circuit_breaker(name=furl(settings.sms_request_url).host).available_calls
+        if available_calls == 0:
+            return 0
+        limit = settings.sms_outbox_batch_size
+        if available_calls is not None:
+            limit = min(limit, available_calls)
+        smses = await SmsRepository.get_list_to_send(limit=limit)
+        await asyncio.gather(*[SmsService.send(sms=sms) for sms in smses])
+        return len(smses)
@@ -0,0 +1,56 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from app.db.models import Click, Lead, Referral, StatKinds
+from app.repositories import PartnerRepository, StatRepository
+from app.services.base import BaseService
+from config import settings
+
+
+class StatService(BaseService):
+    @staticmethod
+    async def rebuild(batch_size: int = settings.stats_rebuild_batch_size):
+        for kind, model in (
+                (StatKinds.CLICK, Click),
+                (StatKinds.LEAD, Lead),
+                (StatKinds.REFERRAL, Referral),
+        ):
+            count, cursor = 0, None
+            while True:
+                rows, cursor = await PartnerRepository().get_ids_page(limit=batch_size, cursor=cursor)
+                partners_ids = [partner_id for partner_id, in rows]
+                if partners_ids:
+                    await StatRepository.rebuild(kind=kind, model=model, partners_ids=partners_ids)
+                    count += len(partners_ids)
+                if cursor is None:
+                    break
+            logging.info(msg=f'Stats {kind}: rebuilt for {count} partners')
+
+    @staticmethod
+    async def prune(batch_size: int = 1000) -> int:
+        # Hour buckets are only read for the last week, totals come from day buckets
+        started_at = datetime.now(tz=timezone.utc).replace(tzinfo=None, minute=0, second=0, microsecond=0)
+        started_at -= timedelta(days=settings.stats_hours_retention_days)
+        count = 0
+        while True:
+            deleted = await StatRepository.delete_hours_before(started_at=started_at, limit=batch_size)
+            count += deleted
+            if deleted < batch_size:
+                return count
@@ -17,23 +17,43 @@
 
 import asyncio
 import logging
+import signal
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
+from app.tasks.permanents.sms_dispatcher import sms_dispatcher
+from app.tasks.permanents.stats_pruner import stats_pruner
 from app.tasks.permanents.sync_gd import sync_gd
+from app.services.action import actions_buffer
+from app.utils.http_client import http_client
+from config import settings
 
 prefix = '[start_app]'
 
 
 TASKS = [
     sync_gd,
+    sms_dispatcher,
+    stats_pruner,
 ]
 
 
 async def start_app() -> None:
     scheduler = AsyncIOScheduler()
     logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-    while True:
-        tasks_names = [task.get_name() for task in asyncio.all_tasks()]
-        [asyncio.create_task(coro=task(scheduler), name=task.__name__) for task in TASKS if task.__name__ not in tasks_names]
-        await asyncio.sleep(10 * 60)
+    # Stop through the finally block below, so buffered actions are flushed
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    await http_client.start()
+    if settings.actions_async:
+        await actions_buffer.start()
+    try:
+        while True:
+            tasks_names = [task.get_name() for task in asyncio.all_tasks()]
+            [asyncio.create_task(coro=task(scheduler), name=task.__name__) for task in TASKS if task.__name__ not in tasks_names]
+            await asyncio.sleep(10 * 60)
+    finally:
+        if scheduler.running:
+            scheduler.shutdown(wait=False)
+        if settings.actions_async:
+            await actions_buffer.stop()
+        await http_client.stop()
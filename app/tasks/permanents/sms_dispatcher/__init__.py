@@ -0,0 +1,35 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import asyncio
+import logging
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.services.sms import SmsService
+from config import settings
+
+
+async def sms_dispatcher(scheduler: AsyncIOScheduler):
+    while True:
+        try:
+            count = await SmsService.dispatch()
+        except Exception as e:
+            logging.exception(e)
+            count = 0
+        if count < settings.sms_outbox_batch_size:
+            await asyncio.sleep(settings.sms_outbox_poll_interval / 1000)
@@ -0,0 +1,35 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import asyncio
+import logging
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.services.stat import StatService
+from config import settings
+
+
+async def stats_pruner(scheduler: AsyncIOScheduler):
+    while True:
+        try:
+            count = await StatService.prune()
+            if count:
+                logging.info(msg=f'Stats: pruned {count} hour buckets')
+        except Exception as e:
+            logging.exception(e)
+        await asyncio.sleep(settings.stats_prune_interval)
@@ -22,5 +22,13 @@ from app.tasks.permanents.sync_gd.syncers import sync as go_sync_gd
 
 
 async def sync_gd(scheduler: AsyncIOScheduler):
-    scheduler.add_job(go_sync_gd, trigger=CronTrigger.from_crontab('* * * * *'), id='sync_gd')
-    scheduler.start()
+    scheduler.add_job(
+        go_sync_gd,
+        trigger=CronTrigger.from_crontab('* * * * *'),
+        id='sync_gd',
+        max_instances=1,
+        coalesce=True,
+        replace_existing=True,
+    )
+    if not scheduler.running:
+        scheduler.start()
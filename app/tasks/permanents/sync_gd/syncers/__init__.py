@@ -23,4 +23,8 @@ from ..utils import google_sheets_api_client
 async def sync():
     table = await google_sheets_api_client.get_table_by_name(name=settings.sync_partners_table_name)
 
-    await sync_partners(table=table)
+    try:
+        await sync_partners(table=table)
+    except Exception:
+        google_sheets_api_client.forget_table(name=settings.sync_partners_table_name)
+        raise
@@ -13,82 +13,123 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+
+
+
+import asyncio
 import logging
+from collections import defaultdict
+from hashlib import sha256
 
-from addict import Dict
-from aiohttp import ClientSession
 from gspread import Spreadsheet
 
+from app.repositories import PartnerRepository, PromotionRepository
+from app.services import PartnerService
+from app.utils.exceptions import ApiException
 from app.utils.normalize_phone import normalize_phone_number
 from config import settings
 from ..utils.google_sheets_api_client import google_sheets_api_client
 
 
+# promotion_id -> (table modified time, sheet rows fingerprint, partners phones fingerprint) of the last clean sync
+fingerprints: dict[int, tuple[str, str, str]] = {}
+
+
+def create_fingerprint(values) -> str:
+    return sha256('\n'.join(sorted(values)).encode()).hexdigest()
+
+
 async def sync_partners(table: Spreadsheet):
 
-    def find_expired_partners(promotion_partners, sheet_partners):
-        promotion_partners_phones = {partner['phone'] for partner in promotion_partners if 'phone' in partner}
+    def find_expired_partners(promotion_partners_phones, sheet_partners):
         sheet_partners_phones = {partner['Телефон'] for partner in sheet_partners if 'Телефон' in partner}
         expired = promotion_partners_phones - sheet_partners_phones
         new = sheet_partners_phones - expired - promotion_partners_phones
         return expired, new
 
-    async with ClientSession(settings.api_url) as session:
-        async with session.get(
-            url='/admin/promotions/list/get',
-            params={
-                'token': f'0:{settings.root_token}',
-            },
-        ) as r:
-            promotions = (await r.json())['promotions']
-
-        for promotion in promotions:
-            promotion = Dict(**promotion)
+    table_modified_time = await google_sheets_api_client.get_table_modified_time(table=table)
+    promotions = await PromotionRepository().get_list()
+    promotions_partners_phones = defaultdict(set)
+    for promotion_id, phone in await PartnerRepository.get_phones_by_promotions():
+        promotions_partners_phones[promotion_id].add(phone)
+
+    changed_promotions = []
+    for promotion in promotions:
+        fingerprint = fingerprints.get(promotion.id)
+        partners_fingerprint = create_fingerprint(promotions_partners_phones[promotion.id])
+        if fingerprint and fingerprint[0] == table_modified_time and fingerprint[2] == partners_fingerprint:
+            continue
+        changed_promotions.append(promotion)
+    if not changed_promotions:
+        return
+    sheets_titles = {
+        title.lower(): title
+        for title in await google_sheets_api_client.get_sheets_titles(table=table)
+    }
+    changed_promotions = [promotion for promotion in changed_promotions if promotion.name.lower() in sheets_titles]
+    sheets_rows = await google_sheets_api_client.get_rows_by_sheets_titles(
+        table=table,
+        titles=[sheets_titles[promotion.name.lower()] for promotion in changed_promotions],
+    )
+
+    semaphore = asyncio.Semaphore(settings.sync_concurrency)
+
+    async def delete_partner(promotion_id: int, phone: str) -> bool:
+        async with semaphore:
             try:
-                sheet = await google_sheets_api_client.get_sheet_by_table_and_name(table=table, name=promotion.name)
-            except Exception:
-                continue
-            rows = await google_sheets_api_client.get_rows(sheet=sheet)
-            for row in rows:
-                row.Телефон = normalize_phone_number(row.Телефон)
-            expired_partners_phones, new_partners_phones = find_expired_partners(
-                promotion_partners=promotion.partners,
-                sheet_partners=rows,
-            )
-            for phone in expired_partners_phones:
-                await session.post(
-                    url='/admin/partners/delete/by-phone',
-                    json={
-                        'token': f'0:{settings.root_token}',
-                        'phone': phone,
-                        'promotion_id': promotion.id,
-                    },
-                )
-            for row in rows:
-                if row.Телефон in new_partners_phones:
-                    async with session.post(
-                        url='/admin/clients/create',
-                        json={
-                            'token': f'0:{settings.root_token}',
-                            'fullname': row.Имя,
-                            'phone': row.Телефон,
-                            'is_partner': True,
-                        },
-                    ) as r:
-                        data = Dict(**await r.json())
-                        if data.state == 'error':
-                            client_id = data.error.kwargs.model_id
-                        else:
-                            client_id = data.id
-                        logging.log(level=1, msg='Partner create...')
-                        response = await session.post(
-                            url='/admin/partners/create',
-                            json={
-                                'token': f'0:{settings.root_token}',
-                                'promotion_id': promotion.id,
-                                'client_id': client_id,
-                            },
-                        )
-                        logging.log(level=logging.INFO, msg=await response.json())
+                await PartnerService().delete_by_phone_by_task(phone=phone, promotion_id=promotion_id)
+            except ApiException as e:
+                logging.warning(msg=f'Partner {phone} delete from promotion {promotion_id} failed: {e.kwargs}')
+                return False
+        return True
+
+    async def create_partners(promotion_id: int, rows) -> bool:
+        if not rows:
+            return True
+        results = await PartnerService().bulk_upsert(
+            creator='sync_task',
+            items=[{'promotion_id': promotion_id, 'fullname': row.Имя, 'phone': row.Телефон} for row in rows],
+        )
+        for result in results:
+            if result['state'] == 'error':
+                logging.warning(msg=f'Partner {result["phone"]} create in promotion {promotion_id} failed: {result["error"]}')
+            elif result['state'] == 'created':
+                logging.log(level=logging.INFO, msg=f'Partner {result["id"]} created')
+        return all(result['state'] != 'error' for result in results)
 
+    async def sync_promotion(promotion):
+        fingerprint = fingerprints.get(promotion.id)
+        partners_phones = promotions_partners_phones[promotion.id]
+        partners_fingerprint = create_fingerprint(partners_phones)
+        rows = sheets_rows[sheets_titles[promotion.name.lower()]]
+        for row in rows:
+            row.Телефон = normalize_phone_number(row.Телефон)
+        rows_fingerprint = create_fingerprint(f'{row.Телефон}\t{row.Имя}' for row in rows)
+        if fingerprint and fingerprint[1] == rows_fingerprint and fingerprint[2] == partners_fingerprint:
+            fingerprints[promotion.id] = (table_modified_time, rows_fingerprint, partners_fingerprint)
+            return
+        expired_partners_phones, new_partners_phones = find_expired_partners(
+            promotion_partners_phones=partners_phones,
+            sheet_partners=rows,
+        )
+        new_rows = {row.Телефон: row for row in rows if row.Телефон in new_partners_phones}
+        results = await asyncio.gather(
+            *[delete_partner(promotion_id=promotion.id, phone=phone) for phone in expired_partners_phones],
+            create_partners(promotion_id=promotion.id, rows=list(new_rows.values())),
+        )
+        if all(results):
+            fingerprints[promotion.id] = (
+                table_modified_time,
+                rows_fingerprint,
+                create_fingerprint((partners_phones - expired_partners_phones) | new_partners_phones),
+            )
+        else:
+            fingerprints.pop(promotion.id, None)
 
+    results = await asyncio.gather(
+        *[sync_promotion(promotion) for promotion in changed_promotions],
+        return_exceptions=True,
+    )
+    for promotion, result in zip(changed_promotions, results):
+        if isinstance(result, Exception):
+            logging.error(msg=f'Promotion {promotion.id} sync failed: {result!r}')
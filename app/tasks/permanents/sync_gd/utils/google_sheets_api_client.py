@@ -15,11 +15,18 @@
 #
 
 
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 import gspread
 from addict import Dict
 from gspread import Spreadsheet, Worksheet
 from oauth2client.service_account import ServiceAccountCredentials
 
+from config import settings
+
 
 FEEDS = 'https://spreadsheets.google.com/feeds'
 DRIVE = 'https://www.googleapis.com/auth/drive'
@@ -27,45 +34,83 @@ SCOPES = 'https://www.googleapis.com/auth/realtime-bidding'
 
 
 class GoogleSheetsApiClient:
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, workers: int):
         self.scope = [FEEDS, DRIVE]
         self.creds = ServiceAccountCredentials.from_json_keyfile_name(
             filename=filename,
             scopes=self.scope,
         )
         self.client = gspread.authorize(self.creds)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='google_sheets')
+        self.tables: dict[str, Spreadsheet] = {}
+
+    async def _run(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
 
     async def get_tables(self) -> list[Spreadsheet]:
-        return self.client.openall()
+        return await self._run(self.client.openall)
 
     async def get_table_by_name(self, name: str) -> Spreadsheet:
+        if name.lower() in self.tables:
+            return self.tables[name.lower()]
         tables = await self.get_tables()
         for table in tables:
             if table.title.lower() == name.lower():
+                self.tables[name.lower()] = table
                 return table
         raise Exception('Required table not found')
 
-    @staticmethod
-    async def get_sheet_by_table_and_name(table: Spreadsheet, name: str) -> Worksheet:
-        worksheets = table.worksheets()
+    def forget_table(self, name: str):
+        self.tables.pop(name.lower(), None)
+
+    async def get_table_modified_time(self, table: Spreadsheet) -> str:
+        return await self._run(table.get_lastUpdateTime)
+
+    async def get_sheets_titles(self, table: Spreadsheet) -> list[str]:
+        return [worksheet.title for worksheet in await self._run(table.worksheets)]
+
+    async def get_sheet_by_table_and_name(self, table: Spreadsheet, name: str) -> Worksheet:
+        worksheets = await self._run(table.worksheets)
         for worksheet in worksheets:
             if worksheet.title.lower() == name.lower():
                 return worksheet
         raise Exception('Required sheet not found')
 
-    @staticmethod
-    async def get_columns_by_name(worksheet: Worksheet, column_name: str):
-        column_index = worksheet.row_values(1).index(column_name) + 1
-        return worksheet.col_values(column_index)
+    async def get_columns_by_name(self, worksheet: Worksheet, column_name: str):
+        column_index = (await self._run(worksheet.row_values, 1)).index(column_name) + 1
+        return await self._run(worksheet.col_values, column_index)
 
-    @staticmethod
-    async def get_rows(sheet: Worksheet):
+    async def get_rows(self, sheet: Worksheet):
         data = {
-            'rows': sheet.get_all_records(),
+            'rows': await self._run(sheet.get_all_records),
         }
         return Dict(**data).rows
 
+    async def get_rows_by_sheets_titles(self, table: Spreadsheet, titles: list[str]) -> dict[str, list[Dict]]:
+        if not titles:
+            return {}
+        ranges = ["'{}'".format(title.replace("'", "''")) for title in titles]
+        response = await self._run(table.values_batch_get, ranges=ranges)
+        sheets_rows = {}
+        for title, value_range in zip(titles, response.get('valueRanges', [])):
+            values = value_range.get('values', [])
+            if not values:
+                sheets_rows[title] = []
+                continue
+            header, values = values[0], values[1:]
+            data = {
+                'rows': [
+                    dict(zip(header, row + [''] * (len(header) - len(row))))
+                    for row in values
+                    if any(value != '' for value in row)
+                ],
+            }
+            sheets_rows[title] = Dict(**data).rows
+        return sheets_rows
+
 
 google_sheets_api_client = GoogleSheetsApiClient(
     filename='google_creds.json',
+    workers=settings.google_sheets_workers,
 )
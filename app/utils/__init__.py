@@ -18,7 +18,7 @@
 from app.utils.exceptions.base import ApiException
 from .middleware import Middleware
 from .router import Router
-from .response import Response, ResponseState
+from .response import Response, ResponseState, StreamResponse, StreamFormats, CsvResponse
 from . import crypto
 from . import client
 from .use_schema import use_schema
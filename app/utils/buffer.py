@@ -0,0 +1,196 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+
+import asyncio
+import fcntl
+import logging
+import os
+from contextlib import suppress
+from glob import glob
+from json import dumps, loads
+from typing import Callable, Awaitable
+
+
+class Buffer:
+    def __init__(
+            self,
+            name: str,
+            function: Callable[[list[dict]], Awaitable],
+            max_size: int,
+            flush_interval: int,
+            spill_dir: str = None,
+            max_retries: int = 5,
+    ):
+        self.name = name
+        self.function = function
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.spill_dir = spill_dir
+        self.max_retries = max_retries
+        self.retries = 0
+        self.items: list[dict] = []
+        self.lock = asyncio.Lock()
+        self.task = None
+        self.stopped = asyncio.Event()
+        self.flush_task = None
+        self.spill_file = None
+        self.spill_file_synced = True
+
+    async def start(self):
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self.items += self._recover_spill_files()
+            await self._rewrite_spill_file()
+        self.stopped.clear()
+        self.task = asyncio.create_task(self._run(), name=f'buffer_{self.name}')
+
+    async def stop(self):
+        if self.task:
+            self.stopped.set()
+            await self.task
+            self.task = None
+        if self.flush_task:
+            await self.flush_task
+        await self.flush()
+        if self.spill_file:
+            self.spill_file.close()
+            self.spill_file = None
+            if not self.items:
+                os.remove(self.spill_path)
+
+    async def put(self, item: dict):
+        self.items.append(item)
+        if self.spill_file:
+            self.spill_file.write(dumps(item) + '\n')
+            self.spill_file.flush()
+            self.spill_file_synced = False
+        if len(self.items) >= self.max_size and not self.lock.locked() and not self.flush_task:
+            self.flush_task = asyncio.create_task(self._flush_in_background())
+
+    async def flush(self):
+        async with self.lock:
+            while self.items:
+                items, self.items = self.items[:self.max_size], self.items[self.max_size:]
+                try:
+                    await self.function(items)
+                except Exception as e:
+                    logging.error(msg=f'Buffer {self.name}: flush of {len(items)} items failed: {e}')
+                    self.retries += 1
+                    if self.retries < self.max_retries:
+                        self.items = items + self.items
+                        break
+                    # A batch that keeps failing would block everything queued behind it
+                    await self._dead_letter(items=items)
+                except BaseException:
+                    self.items = items + self.items
+                    raise
+                self.retries = 0
+                await self._rewrite_spill_file()
+
+    async def _dead_letter(self, items: list[dict]):
+        logging.error(msg=f'Buffer {self.name}: dropping {len(items)} items after {self.retries} failed flushes')
+        if self.spill_dir:
+            await asyncio.to_thread(self._write_dead_letter_file, items)
+        else:
+            for item in items:
+                logging.error(msg=f'Buffer {self.name}: dropped item {dumps(item)}')
+
+    def _write_dead_letter_file(self, items: list[dict]):
+        with open(os.path.join(self.spill_dir, f'{self.name}.dead.jsonl'), 'a') as file:
+            file.write(''.join(dumps(item) + '\n' for item in items))
+            file.flush()
+            os.fsync(file.fileno())
+
+    async def _flush_in_background(self):
+        try:
+            await self.flush()
+        finally:
+            self.flush_task = None
+
+    async def _run(self):
+        while not self.stopped.is_set():
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self.stopped.wait(), timeout=self.flush_interval / 1000)
+            await self._sync_spill_file()
+            await self.flush()
+
+    async def _sync_spill_file(self):
+        # Spill writes only reach the page cache in put(), fsync is batched here
+        # once per interval and runs off the event loop
+        if self.spill_file and not self.spill_file_synced:
+            self.spill_file_synced = True
+            await asyncio.to_thread(os.fsync, self.spill_file.fileno())
+
+    @property
+    def spill_path(self) -> str:
+        return os.path.join(self.spill_dir, f'{self.name}-{os.getpid()}.jsonl')
+
+    async def _rewrite_spill_file(self):
+        if not self.spill_dir:
+            return
+        items = list(self.items)
+        spill_file = await asyncio.to_thread(self._write_spill_file, items)
+        # Items put while the new file was written only reached the old one
+        for item in self.items[len(items):]:
+            spill_file.write(dumps(item) + '\n')
+        spill_file.flush()
+        if self.spill_file:
+            self.spill_file.close()
+        self.spill_file = spill_file
+        self.spill_file_synced = len(self.items) == len(items)
+
+    def _write_spill_file(self, items: list[dict]):
+        # The file is locked before it is visible under a name recovery looks at,
+        # and replaces the previous one atomically once it is on disk
+        path = self.spill_path
+        spill_file = open(f'{path}.tmp', 'w')
+        fcntl.flock(spill_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        spill_file.write(''.join(dumps(item) + '\n' for item in items))
+        spill_file.flush()
+        os.fsync(spill_file.fileno())
+        os.replace(f'{path}.tmp', path)
+        spill_dir = os.open(self.spill_dir, os.O_RDONLY)
+        try:
+            os.fsync(spill_dir)
+        finally:
+            os.close(spill_dir)
+        return spill_file
+
+    def _recover_spill_files(self) -> list[dict]:
+        items = []
+        for path in glob(os.path.join(self.spill_dir, f'{self.name}-*.jsonl')):
+            try:
+                file = open(path, 'r+')
+            except FileNotFoundError:
+                continue
+            with file:
+                try:
+                    fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                # The owner may have replaced the file between our open and flock
+                try:
+                    if os.fstat(file.fileno()).st_ino != os.stat(path).st_ino:
+                        continue
+                except FileNotFoundError:
+                    continue
+                items += [loads(line) for line in file if line.strip()]
+                os.remove(path)
+        if items:
+            logging.info(msg=f'Buffer {self.name}: recovered {len(items)} items from spill files')
+        return items
@@ -0,0 +1,62 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable
+
+
+class Cache:
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.items: OrderedDict = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key, default=None) -> Any:
+        with self.lock:
+            item = self.items.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at < monotonic():
+                del self.items[key]
+                return default
+            self.items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.items[key] = (monotonic() + self.ttl, value)
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.items.pop(key, None)
+
+    def delete_by(self, function: Callable[[Any, Any], bool]):
+        with self.lock:
+            for key in [key for key, (_, value) in self.items.items() if function(key, value)]:
+                del self.items[key]
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
@@ -0,0 +1,107 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+
+import logging
+from collections import Counter
+from time import monotonic
+
+from app.utils.exceptions import ExternalServiceUnavailable
+from config import settings
+
+
+class CircuitBreakerStates:
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int,
+            recovery_timeout: float,
+            half_open_max_calls: int,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CircuitBreakerStates.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.half_open_calls = 0
+        self.transitions: Counter = Counter()
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == CircuitBreakerStates.OPEN and monotonic() - self.opened_at < self.recovery_timeout
+
+    @property
+    def available_calls(self) -> int | None:
+        if self.state == CircuitBreakerStates.CLOSED:
+            return None
+        if self.is_open:
+            return 0
+        if self.state == CircuitBreakerStates.OPEN:
+            return self.half_open_max_calls
+        return max(self.half_open_max_calls - self.half_open_calls, 0)
+
+    def before_call(self):
+        if self.state == CircuitBreakerStates.OPEN:
+            if monotonic() - self.opened_at < self.recovery_timeout:
+                raise ExternalServiceUnavailable(kwargs={'service': self.name})
+            self._set_state(CircuitBreakerStates.HALF_OPEN)
+        if self.state == CircuitBreakerStates.HALF_OPEN:
+            if self.half_open_calls >= self.half_open_max_calls:
+                raise ExternalServiceUnavailable(kwargs={'service': self.name})
+            self.half_open_calls += 1
+
+    def success(self):
+        self.failures = 0
+        if self.state != CircuitBreakerStates.CLOSED:
+            self._set_state(CircuitBreakerStates.CLOSED)
+
+    def failure(self):
+        self.failures += 1
+        if self.state == CircuitBreakerStates.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._set_state(CircuitBreakerStates.OPEN)
+
+    def _set_state(self, state: str):
+        self.transitions[f'{self.state}->{state}'] += 1
+        logging.warning(msg=f'Circuit breaker {self.name}: {self.state} -> {state}')
+        self.state = state
+        self.half_open_calls = 0
+        if state == CircuitBreakerStates.OPEN:
+            self.opened_at = monotonic()
+        elif state == CircuitBreakerStates.CLOSED:
+            self.failures = 0
+
+
+circuit_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    if name not in circuit_breakers:
+        circuit_breakers[name] = CircuitBreaker(
+            name=name,
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            recovery_timeout=settings.circuit_breaker_recovery_timeout,
+            half_open_max_calls=settings.circuit_breaker_half_open_max_calls,
+        )
+    return circuit_breakers[name]
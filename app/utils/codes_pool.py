@@ -0,0 +1,65 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+
+import asyncio
+import logging
+from typing import Callable, Awaitable
+
+
+class CodesPool:
+    def __init__(
+            self,
+            name: str,
+            generate: Callable[[], str],
+            get_existing: Callable[[list[str]], Awaitable[set[str]]],
+            size: int,
+    ):
+        self.name = name
+        self.generate = generate
+        self.get_existing = get_existing
+        self.size = size
+        self.codes: set[str] = set()
+        self.task = None
+
+    async def get(self) -> str:
+        return (await self.get_many(count=1))[0]
+
+    async def get_many(self, count: int) -> list[str]:
+        codes = []
+        while self.codes and len(codes) < count:
+            codes.append(self.codes.pop())
+        if self.size and len(self.codes) < self.size // 2 and not self.task:
+            self.task = asyncio.create_task(self._refill(), name=f'codes_pool_{self.name}')
+        if len(codes) < count:
+            codes += await self._generate_free(count=count - len(codes), exclude=set(codes))
+        return codes
+
+    async def _generate_free(self, count: int, exclude: set[str]) -> list[str]:
+        codes = set()
+        while len(codes) < count:
+            candidates = {self.generate() for _ in range(count - len(codes))} - codes - exclude - self.codes
+            codes |= candidates - await self.get_existing(list(candidates))
+        return list(codes)
+
+    async def _refill(self):
+        try:
+            self.codes |= set(await self._generate_free(count=self.size - len(self.codes), exclude=set()))
+        except Exception as e:
+            logging.error(msg=f'Codes pool {self.name}: refill failed: {e}')
+        finally:
+            self.task = None
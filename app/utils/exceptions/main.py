@@ -61,3 +61,8 @@ class VariableDoesNotMatchFormat(ApiException):
 class NoRequiredKeysForString(ApiException):
     code = 1008
     message = "No required keys for {variable}. Missing key: {key}"
+
+
+class ExternalServiceUnavailable(ApiException):
+    code = 1009
+    message = 'External service {service} is unavailable'
@@ -0,0 +1,78 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+
+import asyncio
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from config import settings
+
+
+class HttpClient:
+    def __init__(
+            self,
+            limit: int,
+            limit_per_host: int,
+            keepalive_timeout: int,
+            dns_cache_ttl: int,
+            connect_timeout: float,
+            total_timeout: float,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self.session: ClientSession | None = None
+        self.lock = asyncio.Lock()
+
+    async def start(self):
+        await self.get_session()
+
+    async def stop(self):
+        async with self.lock:
+            if self.session:
+                await self.session.close()
+                self.session = None
+
+    async def get_session(self) -> ClientSession:
+        if self.session and not self.session.closed:
+            return self.session
+        async with self.lock:
+            if not self.session or self.session.closed:
+                self.session = ClientSession(
+                    connector=TCPConnector(
+                        limit=self.limit,
+                        limit_per_host=self.limit_per_host,
+                        keepalive_timeout=self.keepalive_timeout,
+                        ttl_dns_cache=self.dns_cache_ttl,
+                        use_dns_cache=True,
+                    ),
+                    timeout=self.timeout,
+                )
+        return self.session
+
+
+http_client = HttpClient(
+    limit=settings.http_pool_limit,
+    limit_per_host=settings.http_pool_limit_per_host,
+    keepalive_timeout=settings.http_keepalive_timeout,
+    dns_cache_ttl=settings.http_dns_cache_ttl,
+    connect_timeout=settings.http_connect_timeout,
+    total_timeout=settings.http_total_timeout,
+)
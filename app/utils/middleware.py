@@ -19,27 +19,52 @@ from json import loads
 
 from fastapi import Request
 from pydantic import ValidationError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.db.db import db
+from app.db.db import RequestScope, request_scope
 from app.utils.exceptions import ApiException
 from app.utils.response import ResponseState, Response
 from app.utils.validation_error import validation_error
 
 
 class Middleware:
-    async def __call__(self, request: Request, call_next):
-        with db:
-            try:
-                response = await call_next(request)
-            except ApiException as e:
-                response = Response(
-                    state=ResponseState.error,
-                    error={
-                        'code': e.code,
-                        'kwargs': e.kwargs,
-                        'message': e.message.format(**e.kwargs),
-                    }
-                )
-            except ValidationError as e:
-                response = await validation_error(_=request, exception=loads(e.json()))
-        return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message['type'] == 'http.response.start':
+                response_started = True
+            await send(message)
+
+        db_scope = RequestScope()
+        token = request_scope.set(db_scope)
+        try:
+            await self.app(scope, receive, send_wrapper)
+            return
+        except ApiException as e:
+            if response_started:
+                raise
+            response = Response(
+                state=ResponseState.error,
+                error={
+                    'code': e.code,
+                    'kwargs': e.kwargs,
+                    'message': e.message.format(**e.kwargs),
+                }
+            )
+        except ValidationError as e:
+            if response_started:
+                raise
+            response = await validation_error(_=Request(scope), exception=loads(e.json()))
+        finally:
+            db_scope.release()
+            request_scope.reset(token)
+        await response(scope, receive, send)
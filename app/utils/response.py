@@ -15,7 +15,56 @@
 #
 
 
-from starlette.responses import JSONResponse
+import csv
+from datetime import date, datetime
+from decimal import Decimal
+from io import StringIO
+from json import dumps
+from typing import Any, AsyncIterator
+
+from starlette.responses import JSONResponse, StreamingResponse
+
+from config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f'Object of type {value.__class__.__name__} is not JSON serializable')
+
+
+def _dumps_json(content: Any) -> bytes:
+    return dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(',', ':'),
+        default=_default,
+    ).encode('utf-8')
+
+
+def _dumps_orjson(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+serializers = {
+    'json': _dumps_json,
+    'orjson': _dumps_orjson if orjson else _dumps_json,
+}
+serialize = serializers[settings.json_backend]
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return serialize(content)
 
 
 class ResponseState:
@@ -29,4 +78,86 @@ class Response:
             'state': state,
             **kwargs,
         }
-        return JSONResponse(content=json, headers=headers)
+        return FastJSONResponse(content=json, headers=headers)
+
+
+class StreamFormats:
+    json = 'json'
+    ndjson = 'ndjson'
+
+
+class StreamResponse:
+    def __new__(
+            cls,
+            key: str,
+            items: AsyncIterator[dict],
+            format_: str = StreamFormats.json,
+            headers: dict = None,
+    ) -> StreamingResponse:
+        if format_ == StreamFormats.ndjson:
+            return StreamingResponse(
+                content=cls._generate_ndjson(items=items),
+                media_type='application/x-ndjson',
+                headers=headers,
+            )
+        return StreamingResponse(
+            content=cls._generate_json(key=key, items=items),
+            media_type='application/json',
+            headers=headers,
+        )
+
+    @staticmethod
+    async def _generate_json(key: str, items: AsyncIterator[dict]):
+        yield b'{"state":"' + ResponseState.successful.encode() + b'",' + serialize(key) + b':['
+        separator = b''
+        async for item in items:
+            yield separator + serialize(item)
+            separator = b','
+        yield b']}'
+
+    @staticmethod
+    async def _generate_ndjson(items: AsyncIterator[dict]):
+        async for item in items:
+            yield serialize(item) + b'\n'
+
+
+class CsvResponse:
+    def __new__(
+            cls,
+            filename: str,
+            columns: list[str],
+            rows: AsyncIterator[tuple],
+            chunk_size: int = settings.stream_batch_size,
+    ) -> StreamingResponse:
+        return StreamingResponse(
+            content=cls._generate(columns=columns, rows=rows, chunk_size=chunk_size),
+            media_type='text/csv; charset=utf-8',
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+        )
+
+    formula_prefixes = ('=', '+', '-', '@', '\t', '\r')
+
+    @staticmethod
+    def _format_value(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, str) and value.startswith(CsvResponse.formula_prefixes):
+            return f"'{value}"
+        return value
+
+    @staticmethod
+    async def _generate(columns: list[str], rows: AsyncIterator[tuple], chunk_size: int):
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        buffer.write('\ufeff')
+        writer.writerow(columns)
+        count = 0
+        async for row in rows:
+            writer.writerow([CsvResponse._format_value(value) for value in row])
+            count += 1
+            if count >= chunk_size:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+                count = 0
+        yield buffer.getvalue().encode('utf-8')
@@ -1,7 +1,9 @@
 from base64 import b64encode
 
-from aiohttp import ClientSession
+from furl import furl
 
+from app.utils.circuit_breaker import get_circuit_breaker
+from app.utils.http_client import http_client
 from config import settings
 
 
@@ -11,19 +13,27 @@ def basic_auth(username, password):
 
 
 async def sms_request(phone_number: str, message: str):
-    async with ClientSession() as session:
-        try:
-            response = await session.get(
-                url=settings.sms_request_url,
-                params={
-                    'phone': phone_number,
-                    'text': message,
-                    'sender': settings.sms_request_sender,
-                },
-                headers={
-                    "Authorization": basic_auth(settings.sms_request_login, settings.sms_request_password)
-                }
-            )
-        except Exception as e:
-            print(e)
+    circuit_breaker = get_circuit_breaker(name=furl(settings.sms_request_url).host)
+    circuit_breaker.before_call()
+    try:
+        session = await http_client.get_session()
+        async with session.get(
+            url=settings.sms_request_url,
+            params={
+                'phone': phone_number,
+                'text': message,
+                'sender': settings.sms_request_sender,
+            },
+            headers={
+                "Authorization": basic_auth(settings.sms_request_login, settings.sms_request_password)
+            }
+        ) as response:
+            await response.read()
+    except BaseException:
+        circuit_breaker.failure()
+        raise
+    if response.status >= 500:
+        circuit_breaker.failure()
+    else:
+        circuit_breaker.success()
     return response
@@ -0,0 +1,37 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import os
+
+
+# Settings are required at import time; benchmarks never reach the services
+for key, value in {
+    'API_PORT': '8000',
+    'API_URL': 'http://localhost:8000',
+    'MYSQL_HOST': 'localhost',
+    'MYSQL_PORT': '3306',
+    'MYSQL_USER': 'user',
+    'MYSQL_PASSWORD': 'password',
+    'MYSQL_NAME': 'name',
+    'SMS_REQUEST_URL': 'http://sms.example.com/send',
+    'SMS_REQUEST_LOGIN': 'login',
+    'SMS_REQUEST_PASSWORD': 'password',
+    'SMS_REQUEST_SENDER': 'sender',
+    'REFERRAL_SITE_URL': 'http://example.com',
+    'ROOT_TOKEN': 'root',
+    'TASKS_TOKEN': 'tasks',
+    'SYNC_PARTNERS_TABLE_NAME': 'table',
+}.items():
+    os.environ.setdefault(key, value)
@@ -0,0 +1,83 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Compares rendering a large admin payload with starlette's JSONResponse and with
+# FastJSONResponse on each json_backend.
+# Run from the repository root: python -m benchmarks.json_response
+
+
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from starlette.responses import JSONResponse
+
+from app.utils.response import serializers
+
+
+RUNS = 20
+
+
+def create_payload(native_datetimes: bool) -> dict:
+    started_at = datetime(2024, 1, 1)
+
+    def format_datetime(value: datetime):
+        return value if native_datetimes else str(value)
+
+    return {
+        'state': 'successful',
+        'promotions': [
+            {
+                'id': promotion_id,
+                'name': f'Промоакция {promotion_id}',
+                'partners': [
+                    {'id': i, 'code': f'{i:06}', 'client_id': i, 'clicks': i * 3, 'leads': i, 'referrals': i // 2}
+                    for i in range(500)
+                ],
+                'leads': [
+                    {
+                        'id': i,
+                        'partner_id': i,
+                        'name': f'Клиент {i}',
+                        'phone': f'+37529{i:07}',
+                        'is_processed': i % 2 == 0,
+                        'created_at': format_datetime(started_at + timedelta(minutes=i)),
+                    }
+                    for i in range(500)
+                ],
+            }
+            for promotion_id in range(10)
+        ],
+    }
+
+
+def measure(render, content) -> tuple[float, int]:
+    body = render(content)
+    started = perf_counter()
+    for _ in range(RUNS):
+        render(content)
+    return (perf_counter() - started) / RUNS * 1e3, len(body)
+
+
+def main():
+    cases = [('JSONResponse', JSONResponse(content=None).render, create_payload(native_datetimes=False))]
+    for backend, serialize in serializers.items():
+        cases.append((f'FastJSONResponse[{backend}]', serialize, create_payload(native_datetimes=True)))
+    for name, render, content in cases:
+        milliseconds, size = measure(render=render, content=content)
+        print(f'{name:26} {milliseconds:7.1f} ms/response {size / 1024:8.0f} KiB')
+
+
+if __name__ == '__main__':
+    main()
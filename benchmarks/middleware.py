@@ -0,0 +1,128 @@
+#
+# (c) 2024, Yegor Yakubovich, yegoryakubovich.com, personal@yegoryakybovich.com
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Compares the plain ASGI Middleware with the BaseHTTPMiddleware dispatch it replaced.
+# Requests are sent straight to the ASGI app, without a server or network.
+# Run from the repository root: python -m benchmarks.middleware
+
+
+import asyncio
+from json import loads
+from time import perf_counter
+
+from fastapi import FastAPI, Request
+from pydantic import ValidationError
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import StreamingResponse
+
+from app.utils.exceptions import ApiException
+from app.utils.middleware import Middleware
+from app.utils.response import Response, ResponseState
+from app.utils.validation_error import validation_error
+
+
+WARMUP = 200
+RUNS = 3
+
+
+async def base_http_dispatch(request: Request, call_next):
+    # The previous dispatch body without 'with db:', so only the middleware mechanism is measured
+    try:
+        response = await call_next(request)
+    except ApiException as e:
+        response = Response(
+            state=ResponseState.error,
+            error={
+                'code': e.code,
+                'kwargs': e.kwargs,
+                'message': e.message.format(**e.kwargs),
+            }
+        )
+    except ValidationError as e:
+        response = await validation_error(_=request, exception=loads(e.json()))
+    return response
+
+
+def create_app(middleware: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/json')
+    async def json_route():
+        return Response(items=[{'id': i, 'name': f'name_{i}'} for i in range(20)])
+
+    @app.get('/stream')
+    async def stream_route():
+        async def chunks():
+            for _ in range(100):
+                yield b'x' * 1024
+        return StreamingResponse(chunks())
+
+    if middleware == 'plain':
+        app.add_middleware(Middleware)
+    else:
+        app.add_middleware(BaseHTTPMiddleware, dispatch=base_http_dispatch)
+    return app
+
+
+async def call(app: FastAPI, path: str):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [],
+        'client': ('127.0.0.1', 50000),
+        'server': ('127.0.0.1', 80),
+    }
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if request_sent:
+            # The client stays connected until the response is sent
+            await asyncio.Event().wait()
+        request_sent = True
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(_):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app: FastAPI, path: str, count: int) -> float:
+    for _ in range(WARMUP):
+        await call(app=app, path=path)
+    started = perf_counter()
+    for _ in range(count):
+        await call(app=app, path=path)
+    return (perf_counter() - started) / count * 1e6
+
+
+async def main():
+    for path, count in (('/json', 5000), ('/stream', 2000)):
+        for middleware in ('base', 'plain'):
+            app = create_app(middleware=middleware)
+            best = min([await measure(app=app, path=path, count=count) for _ in range(RUNS)])
+            print(f'{path:8} {middleware:6} {best:8.1f} us/request')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
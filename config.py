@@ -15,6 +15,8 @@
 #
 
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -27,11 +29,33 @@ class Settings(BaseSettings):
     mysql_user: str
     mysql_password: str
     mysql_name: str
+    mysql_pool: bool = True
+    mysql_pool_max_connections: int = 32
+    mysql_pool_stale_timeout: int = 300
+    mysql_pool_timeout: int = 10
+    mysql_executor_workers: int = 16
 
     sms_request_url: str
     sms_request_login: str
     sms_request_password: str
     sms_request_sender: str
+    sms_outbox_batch_size: int = 50
+    sms_outbox_concurrency: int = 5
+    sms_outbox_poll_interval: int = 2000
+    sms_outbox_max_attempts: int = 5
+    sms_outbox_backoff: int = 30
+    sms_outbox_lease: int = 300
+
+    http_pool_limit: int = 100
+    http_pool_limit_per_host: int = 20
+    http_keepalive_timeout: int = 30
+    http_dns_cache_ttl: int = 300
+    http_connect_timeout: float = 5
+    http_total_timeout: float = 15
+
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_recovery_timeout: float = 30
+    circuit_breaker_half_open_max_calls: int = 1
 
     referral_site_url: str
 
@@ -39,8 +63,42 @@ class Settings(BaseSettings):
     tasks_token: str
 
     sync_partners_table_name: str
+    google_sheets_workers: int = 4
+    sync_concurrency: int = 8
+
+    partner_code_attempts: int = 5
+    partner_codes_pool_size: int = 0
+
+    json_backend: Literal['json', 'orjson'] = 'orjson'
 
     items_per_page: int = 10
+    pagination_limit: int = 100
+    pagination_limit_max: int = 1000
+    stream_batch_size: int = 500
+
+    clicks_buffer: bool = False
+    clicks_buffer_max_size: int = 500
+    clicks_buffer_flush_interval: int = 1000
+    clicks_buffer_spill_dir: str = 'spill'
+
+    actions_async: bool = False
+    actions_buffer_max_size: int = 200
+    actions_buffer_flush_interval: int = 1000
+
+    sessions_cache_ttl: int = 5
+    sessions_cache_max_size: int = 10000
+
+    permissions_cache_ttl: int = 60
+    permissions_cache_max_size: int = 10000
+
+    stats_rollups: bool = False
+    stats_rebuild_batch_size: int = 100
+    stats_hours_retention_days: int = 8
+    stats_prune_interval: int = 3600
+
+    partners_codes_cache_ttl: int = 5
+    partners_codes_cache_max_size: int = 100000
+    missing_partners_codes_cache_ttl: int = 10
 
     model_config = SettingsConfigDict(env_file='.env')
 
@@ -0,0 +1,21 @@
+import os
+
+
+for key, value in {
+    'API_PORT': '8000',
+    'API_URL': 'http://localhost:8000',
+    'MYSQL_HOST': 'localhost',
+    'MYSQL_PORT': '3306',
+    'MYSQL_USER': 'user',
+    'MYSQL_PASSWORD': 'password',
+    'MYSQL_NAME': 'name',
+    'SMS_REQUEST_URL': 'http://sms.example.com/send',
+    'SMS_REQUEST_LOGIN': 'login',
+    'SMS_REQUEST_PASSWORD': 'password',
+    'SMS_REQUEST_SENDER': 'sender',
+    'REFERRAL_SITE_URL': 'http://example.com',
+    'ROOT_TOKEN': 'root',
+    'TASKS_TOKEN': 'tasks',
+    'SYNC_PARTNERS_TABLE_NAME': 'table',
+}.items():
+    os.environ.setdefault(key, value)
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import os
+
+from app.utils.buffer import Buffer
+
+
+def test_stop_during_flush_keeps_items(tmp_path):
+    flushed = []
+
+    async def function(items):
+        await asyncio.sleep(0.05)
+        flushed.extend(items)
+
+    async def run():
+        buffer = Buffer(
+            name='test',
+            function=function,
+            max_size=10,
+            flush_interval=1,
+            spill_dir=str(tmp_path),
+        )
+        await buffer.start()
+        for i in range(3):
+            await buffer.put({'i': i})
+        await asyncio.sleep(0.01)
+        assert buffer.lock.locked()
+        await buffer.stop()
+
+    asyncio.run(run())
+
+    assert sorted(item['i'] for item in flushed) == [0, 1, 2]
+    assert os.listdir(tmp_path) == []
+
+
+def test_cancelled_flush_restores_items(tmp_path):
+    async def function(items):
+        await asyncio.sleep(3600)
+
+    async def run():
+        buffer = Buffer(name='test', function=function, max_size=10, flush_interval=3600, spill_dir=str(tmp_path))
+        await buffer.start()
+        await buffer.put({'i': 1})
+        task = asyncio.create_task(buffer.flush())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        assert buffer.items == [{'i': 1}]
+        await buffer._rewrite_spill_file()
+        with open(buffer.spill_path) as file:
+            assert [json.loads(line) for line in file] == [{'i': 1}]
+        buffer.task.cancel()
+        buffer.spill_file.close()
+
+    asyncio.run(run())
+
+
+def test_spill_file_is_recovered_only_when_unlocked(tmp_path, monkeypatch):
+    async def failing(items):
+        raise ValueError()
+
+    async def run():
+        owner = Buffer(name='test', function=failing, max_size=10, flush_interval=3600, spill_dir=str(tmp_path))
+        await owner.start()
+        await owner.put({'i': 1})
+        await owner.flush()
+
+        monkeypatch.setattr(os, 'getpid', lambda: 1)
+        other = Buffer(name='test', function=failing, max_size=10, flush_interval=3600, spill_dir=str(tmp_path))
+        await other.start()
+        assert other.items == []
+
+        owner.spill_file.close()
+        owner.spill_file = None
+        monkeypatch.setattr(os, 'getpid', lambda: 2)
+        another = Buffer(name='test', function=failing, max_size=10, flush_interval=3600, spill_dir=str(tmp_path))
+        await another.start()
+        assert another.items == [{'i': 1}]
+
+        for buffer in (owner, other, another):
+            buffer.task.cancel()
+        other.spill_file.close()
+        another.spill_file.close()
+
+    asyncio.run(run())
+
+    assert sorted(os.listdir(tmp_path)) == ['test-1.jsonl', 'test-2.jsonl']
+
+
+def test_failing_batch_is_dead_lettered_after_max_retries(tmp_path):
+    flushed = []
+
+    async def function(items):
+        if any(item.get('bad') for item in items):
+            raise ValueError()
+        flushed.extend(items)
+
+    async def run():
+        buffer = Buffer(
+            name='test',
+            function=function,
+            max_size=1,
+            flush_interval=3600,
+            spill_dir=str(tmp_path),
+            max_retries=3,
+        )
+        await buffer.start()
+        await buffer.put({'bad': True})
+        await buffer.put({'i': 1})
+        for _ in range(2):
+            await buffer.flush()
+            assert buffer.items == [{'bad': True}, {'i': 1}]
+        await buffer.flush()
+        assert buffer.items == []
+        await buffer.stop()
+
+    asyncio.run(run())
+
+    assert flushed == [{'i': 1}]
+    with open(tmp_path / 'test.dead.jsonl') as file:
+        assert [json.loads(line) for line in file] == [{'bad': True}]
+    assert os.listdir(tmp_path) == ['test.dead.jsonl']
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.utils import circuit_breaker as circuit_breaker_module
+from app.utils import sms_request as sms_request_module
+from app.utils.circuit_breaker import CircuitBreakerStates, get_circuit_breaker
+from app.utils.sms_request import sms_request
+from furl import furl
+from config import settings
+
+
+class HangingRequest:
+    async def __aenter__(self):
+        await asyncio.sleep(3600)
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class HangingSession:
+    def get(self, **kwargs):
+        return HangingRequest()
+
+
+class HangingHttpClient:
+    async def get_session(self):
+        return HangingSession()
+
+
+@pytest.fixture(autouse=True)
+def circuit_breakers(monkeypatch):
+    # Breakers are process-global, so each test gets its own registry
+    monkeypatch.setattr(circuit_breaker_module, 'circuit_breakers', {})
+
+
+def test_cancelled_half_open_probe_reopens_breaker(monkeypatch):
+    monkeypatch.setattr(sms_request_module, 'http_client', HangingHttpClient())
+    circuit_breaker = get_circuit_breaker(name=furl(settings.sms_request_url).host)
+    circuit_breaker.state = CircuitBreakerStates.OPEN
+    circuit_breaker.opened_at = -circuit_breaker.recovery_timeout
+
+    async def probe():
+        task = asyncio.create_task(sms_request(phone_number='+70000000000', message='test'))
+        await asyncio.sleep(0)
+        assert circuit_breaker.state == CircuitBreakerStates.HALF_OPEN
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(probe())
+
+    assert circuit_breaker.state == CircuitBreakerStates.OPEN
+    assert circuit_breaker.half_open_calls == 0
+    assert circuit_breaker.transitions['half_open->open'] == 1
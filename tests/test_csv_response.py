@@ -0,0 +1,49 @@
+import asyncio
+import csv
+from datetime import datetime
+from io import StringIO
+
+from app.utils.response import CsvResponse
+
+
+async def _rows(rows):
+    for row in rows:
+        yield row
+
+
+def _generate(rows):
+    async def run():
+        return b''.join([
+            chunk async for chunk in CsvResponse._generate(columns=['id', 'name'], rows=_rows(rows), chunk_size=1)
+        ])
+
+    return list(csv.reader(StringIO(asyncio.run(run()).decode('utf-8').lstrip('﻿'))))
+
+
+def test_formula_values_are_escaped():
+    rows = _generate([
+        (1, '=HYPERLINK("http://example.com")'),
+        (2, '+79001234567'),
+        (3, '-1'),
+        (4, '@SUM(A1)'),
+        (5, '\tname'),
+        (6, '\rname'),
+    ])
+
+    assert [name for _, name in rows[1:]] == [
+        '\'=HYPERLINK("http://example.com")',
+        "'+79001234567",
+        "'-1",
+        "'@SUM(A1)",
+        "'\tname",
+        "'\rname",
+    ]
+
+
+def test_plain_values_are_unchanged():
+    rows = _generate([
+        (1, 'Ivan'),
+        (-2, datetime(2024, 1, 2, 3, 4, 5)),
+    ])
+
+    assert rows == [['id', 'name'], ['1', 'Ivan'], ['-2', '2024-01-02T03:04:05']]
@@ -0,0 +1,70 @@
+from peewee import SqliteDatabase
+
+from app.db import migrations
+from app.db.models import Client, Partner, Promotion, Referral
+
+
+def test_indexes_are_created_after_partners_codes_are_deduplicated(monkeypatch):
+    database = SqliteDatabase(':memory:')
+    monkeypatch.setattr(migrations, 'db', database)
+    with database.bind_ctx([Client, Promotion, Partner]):
+        database.create_tables([Client, Promotion])
+        database.execute_sql(
+            'CREATE TABLE partners ('
+            'id INTEGER PRIMARY KEY, code VARCHAR(6), promotion_id INTEGER, client_id INTEGER, is_deleted INTEGER)'
+        )
+        database.execute_sql(
+            "INSERT INTO partners (code, promotion_id, client_id, is_deleted) "
+            "VALUES ('AAAAAA', 1, 1, 1), ('AAAAAA', 1, 2, 0), ('BBBBBB', 1, 3, 0)"
+        )
+
+        # Left behind by an earlier run that named indexes after the model
+        database.execute_sql('CREATE INDEX partner_code_is_deleted ON partners (code, is_deleted)')
+
+        partners_indexes = tuple(index for index in migrations.indexes_0001 if index[1] == 'partners')
+        migrations.create_indexes(indexes=partners_indexes)
+        migrations.create_indexes(indexes=partners_indexes)
+        migrations.deduplicate_partners_codes()
+        migrations.create_indexes(indexes=migrations.indexes_0006)
+
+        indexes = {index.name: (tuple(index.columns), index.unique) for index in database.get_indexes('partners')}
+        codes = [code for code, in Partner.select(Partner.code).order_by(Partner.id).tuples()]
+
+    assert indexes == {
+        'partners_promotion_id_is_deleted': (('promotion_id', 'is_deleted'), False),
+        'partners_code': (('code',), True),
+    }
+    assert codes[1:] == ['AAAAAA', 'BBBBBB']
+    assert codes[0] not in ('AAAAAA', 'BBBBBB')
+
+
+def test_clients_phones_are_deduplicated_before_unique_index(monkeypatch):
+    database = SqliteDatabase(':memory:')
+    monkeypatch.setattr(migrations, 'db', database)
+    with database.bind_ctx([Client, Promotion, Partner, Referral]):
+        database.execute_sql(
+            'CREATE TABLE clients ('
+            'id INTEGER PRIMARY KEY, fullname VARCHAR(128), email VARCHAR(128), phone VARCHAR(16), '
+            'is_partner INTEGER, created_at DATETIME)'
+        )
+        database.create_tables([Promotion, Partner, Referral])
+        database.execute_sql(
+            "INSERT INTO clients (fullname, email, phone, is_partner) "
+            "VALUES ('a', '', '+100', 0), ('b', '', '+100', 1), ('c', '', '+200', 0)"
+        )
+        database.execute_sql("INSERT INTO partners (code, promotion_id, client_id, is_deleted) VALUES ('AAAAAA', 1, 2, 0)")
+        database.execute_sql("INSERT INTO referrals (partner_id, client_id, created_at) VALUES (1, 2, '2024-01-01')")
+        migrations.create_indexes(indexes=tuple(index for index in migrations.indexes_0001 if index[1] == 'clients'))
+
+        migrations.deduplicate_clients_phones()
+        migrations.create_indexes(indexes=migrations.indexes_0009)
+
+        indexes = {index.name: (tuple(index.columns), index.unique) for index in database.get_indexes('clients')}
+        clients = list(Client.select(Client.id, Client.is_partner).order_by(Client.id).tuples())
+        partners_clients = [client_id for client_id, in Partner.select(Partner.client).tuples()]
+        referrals_clients = [client_id for client_id, in Referral.select(Referral.client).tuples()]
+
+    assert indexes == {'clients_phone': (('phone',), True)}
+    assert clients == [(1, True), (3, False)]
+    assert partners_clients == [1]
+    assert referrals_clients == [1]
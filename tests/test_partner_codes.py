@@ -0,0 +1,15 @@
+import asyncio
+from base64 import b64encode
+
+from app.repositories.partner import partners_codes_cache
+from app.services import PartnerService
+
+
+def test_check_code_decodes_and_uses_cached_lookup():
+    partners_codes_cache.set('ABC123', (1, 2))
+    try:
+        result = asyncio.run(PartnerService.check_code(base64code=b64encode(b'ABC123').decode()))
+    finally:
+        partners_codes_cache.delete('ABC123')
+
+    assert result == {'code': 'ABC123'}
@@ -0,0 +1,18 @@
+from app.db.models import Account, Session
+from app.repositories import SessionRepository
+
+
+def test_cached_session_is_rebuilt_per_request():
+    session = Session(id=1, account=2, token_salt='salt', token_hash='hash', is_deleted=False)
+    session.account = Account(id=2, username='admin', is_active=True)
+    data = SessionRepository.to_cache(session=session)
+
+    first = SessionRepository.from_cache(data=data)
+    first.account.is_active = False
+    second = SessionRepository.from_cache(data=data)
+
+    assert first is not second
+    assert (second.id, second.token_hash, second.account_id) == (1, 'hash', 2)
+    assert second.account.username == 'admin'
+    assert second.account.is_active is True
+    assert not second.is_dirty()
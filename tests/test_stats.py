@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta, timezone
+
+from peewee import SqliteDatabase
+
+from app.db.models import Client, Partner, Promotion, Stat, StatKinds
+from app.repositories import ClickRepository, StatRepository
+
+
+def test_counts_from_stats_match_hour_buckets():
+    database = SqliteDatabase(':memory:')
+    now = datetime.now(tz=timezone.utc).replace(tzinfo=None, minute=0, second=0, microsecond=0)
+    rows = [(1, now - timedelta(hours=hours, minutes=30)) for hours in range(0, 400, 5)]
+    rows += [(2, now - timedelta(days=30))]
+    with database.bind_ctx([Client, Promotion, Partner, Stat]):
+        database.create_tables([Client, Promotion, Partner, Stat])
+        Stat.insert_many([
+            {'partner': partner_id, 'kind': StatKinds.CLICK, 'period': period, 'started_at': started_at, 'count': count}
+            for (partner_id, period, started_at), count in StatRepository.get_counts(rows=rows).items()
+        ]).execute()
+        counts = ClickRepository().get_counts_from_stats(group_by=Stat.partner, where=Stat.partner.in_([1, 2]))
+
+    def expected(partner_id):
+        hours = [created_at.replace(minute=0) for id_, created_at in rows if id_ == partner_id]
+        return (
+            len(hours),
+            len([hour for hour in hours if hour >= now - timedelta(days=7)]),
+            len([hour for hour in hours if hour >= now - timedelta(days=1)]),
+        )
+
+    assert counts == {1: expected(1), 2: expected(2)}